@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Compare le débit et la précision des moteurs PDF de l'extracteur.
+
+Usage: python benchmarks/bench_backends.py [fichier.pdf ...] [--pages N] [--repeat N]
+
+Sans argument, mesure le PDF d'exemple des tests et un PDF synthétique au format
+EasyLMD généré avec pypdfium2. Pour les PDF synthétiques la précision est
+mesurée contre les créneaux générés ; pour les PDF réels, contre pdfplumber.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import datetime
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from planning_to_ics.backends import BACKENDS  # noqa: E402
+from planning_to_ics.extractor import extract_courses  # noqa: E402
+from planning_to_ics.models import CourseSlot  # noqa: E402
+
+SAMPLE_PDF = ROOT / "tests" / "fixtures" / "sample_schedule.pdf"
+DAYS_FR = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+COLUMNS = [28.0, 109.0, 190.0, 351.0, 459.0, 567.0]
+HEADERS = ["Date", "Horaire", "Cours", "Classe", "Salle"]
+COURSES = ["Langage C", "Informatique Fondamentale", "Théorie des Graphes"]
+GROUPS = ["GI-L1", "GI-L2", "GC-L3"]
+ROOMS = ["S-301", "S-304", "A-102"]
+ROW_HEIGHT = 30.0
+ROWS_PER_PAGE = 18
+
+
+def _add_text(
+    pdf: pdfium.PdfDocument, page: pdfium.PdfPage, text: str, x: float, y: float
+) -> None:
+    obj = pdfium_c.FPDFPageObj_NewTextObj(pdf.raw, b"Helvetica", 8)
+    buf = ctypes.create_string_buffer((text + "\x00").encode("utf-16-le"))
+    pdfium_c.FPDFText_SetText(obj, ctypes.cast(buf, ctypes.POINTER(pdfium_c.FPDF_WCHAR)))
+    pdfium_c.FPDFPageObj_Transform(obj, 1, 0, 0, 1, x, y)
+    pdfium_c.FPDFPage_InsertObject(page.raw, obj)
+
+
+def _add_rule(page: pdfium.PdfPage, x0: float, y0: float, x1: float, y1: float) -> None:
+    path = pdfium_c.FPDFPageObj_CreateNewPath(x0, y0)
+    pdfium_c.FPDFPath_LineTo(path, x1, y1)
+    pdfium_c.FPDFPath_SetDrawMode(path, pdfium_c.FPDF_FILLMODE_NONE, True)
+    pdfium_c.FPDFPageObj_SetStrokeWidth(path, 0.8)
+    pdfium_c.FPDFPage_InsertObject(page.raw, path)
+
+
+def synthetic_pdf(pages: int) -> tuple[bytes, list[CourseSlot]]:
+    """Génère un PDF EasyLMD synthétique et la liste des créneaux attendus."""
+    start = datetime.date(2026, 2, 2)
+    slots = [
+        CourseSlot(
+            date=start + datetime.timedelta(days=i // 2),
+            start_time=datetime.time(8 if i % 2 == 0 else 14, 0),
+            end_time=datetime.time(12 if i % 2 == 0 else 18, 0),
+            course_name=COURSES[i % len(COURSES)],
+            course_type="CM/TD",
+            class_group=GROUPS[i % len(GROUPS)],
+            room=ROOMS[i % len(ROOMS)],
+        )
+        for i in range(pages * ROWS_PER_PAGE)
+    ]
+    end = slots[-1].date
+
+    pdf = pdfium.PdfDocument.new()
+    for p in range(pages):
+        page = pdf.new_page(595, 842)
+        _add_text(pdf, page, f"Période du {start:%d/%m/%Y} au {end:%d/%m/%Y}", 195, 790)
+        top = 760.0
+        rows = [HEADERS] + [
+            [
+                f"{DAYS_FR[s.date.weekday()]} {s.date:%d/%m/%Y}",
+                f"{s.start_time:%HH%M} - {s.end_time:%HH%M}",
+                f"{s.course_name} ({s.course_type})",
+                s.class_group,
+                s.room,
+            ]
+            for s in slots[p * ROWS_PER_PAGE : (p + 1) * ROWS_PER_PAGE]
+        ]
+        bottom = top - ROW_HEIGHT * len(rows)
+        for x in COLUMNS:
+            _add_rule(page, x, bottom, x, top)
+        for r, cells in enumerate(rows):
+            y = top - ROW_HEIGHT * r
+            _add_rule(page, COLUMNS[0], y, COLUMNS[-1], y)
+            for x, cell in zip(COLUMNS, cells):
+                _add_text(pdf, page, cell, x + 4, y - ROW_HEIGHT / 2 - 3)
+        _add_rule(page, COLUMNS[0], bottom, COLUMNS[-1], bottom)
+        page.gen_content()
+
+    buffer = io.BytesIO()
+    pdf.save(buffer)
+    pdf.close()
+    return buffer.getvalue(), slots
+
+
+def _accuracy(found: list[CourseSlot], expected: list[CourseSlot]) -> float:
+    if not expected:
+        return 1.0 if not found else 0.0
+    matched = sum(1 for a, b in zip(found, expected) if a == b)
+    return matched / max(len(found), len(expected))
+
+
+def _bench(label: str, path: Path, expected: list[CourseSlot] | None, repeat: int) -> None:
+    if expected is None:
+        expected, _ = extract_courses(path, backend="pdfplumber")
+    print(f"\n{label}")
+    for name in sorted(BACKENDS):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            found, _ = extract_courses(path, backend=name)
+        elapsed = (time.perf_counter() - t0) / repeat
+        rate = len(found) / elapsed if elapsed else float("inf")
+        acc = _accuracy(found, expected)
+        print(
+            f"  {name:<11} {elapsed * 1000:8.1f} ms  {rate:9.0f} créneaux/s  précision {acc:.1%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", type=Path, help="PDF EasyLMD supplémentaires")
+    parser.add_argument("--pages", type=int, default=20, help="Pages du PDF synthétique")
+    parser.add_argument("--repeat", type=int, default=3, help="Répétitions par mesure")
+    args = parser.parse_args()
+
+    _bench(SAMPLE_PDF.name, SAMPLE_PDF, None, args.repeat)
+    for pdf_path in args.pdfs:
+        _bench(pdf_path.name, pdf_path, None, args.repeat)
+
+    data, slots = synthetic_pdf(args.pages)
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = Path(tmp) / "synthetic.pdf"
+        synthetic.write_bytes(data)
+        _bench(f"synthétique ({args.pages} pages)", synthetic, slots, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
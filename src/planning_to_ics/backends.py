@@ -0,0 +1,211 @@
+"""Moteurs de lecture PDF interchangeables : pdfplumber (défaut) et pypdfium2.
+
+Un moteur est une fonction qui ouvre un document et fournit ses pages dans un
+gestionnaire de contexte. Chaque page expose ``extract_text()`` et
+``extract_tables()`` avec la même forme de résultat que pdfplumber, ce qui
+permet à l'extracteur d'ignorer le moteur utilisé.
+"""
+
+from __future__ import annotations
+
+import datetime
+import re
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+PdfSource = str | Path | BinaryIO
+Table = list[list[str | None]]
+Rule = tuple[float, float, float]
+
+DEFAULT_BACKEND = "pdfplumber"
+
+# Épaisseur max (en points) d'un objet graphique considéré comme un trait de tableau
+RULE_MAX_THICKNESS = 2.0
+# Tolérance (en points) pour fusionner des traits quasi alignés
+RULE_SNAP_TOLERANCE = 1.5
+
+# Date PDF : D:AAAAMMJJHHmmSS suivi du décalage (Z, +01'00', -0500...)
+PDF_DATE_RE = re.compile(
+    r"D:(\d{4})(\d{2})?(\d{2})?(\d{2})?(\d{2})?(\d{2})?"
+    r"(?:(Z)|([+-])(\d{2})'?(\d{2})?'?)?"
+)
+
+
+class PdfPage(Protocol):
+    """Page PDF telle que consommée par l'extracteur."""
+
+    def extract_text(self) -> str | None: ...
+
+    def extract_tables(self) -> list[Table]: ...
+
+
+PdfBackend = Callable[[PdfSource], AbstractContextManager[Sequence[PdfPage]]]
+
+
+@contextmanager
+def open_pdfplumber(source: PdfSource) -> Iterator[Sequence[PdfPage]]:
+    """Ouvre le document avec pdfplumber (détection de tableaux complète)."""
+    with pdfplumber.open(source) as pdf:
+        yield pdf.pages
+
+
+def _snap(values: list[float]) -> list[float]:
+    """Regroupe des coordonnées triées distantes de moins de la tolérance."""
+    snapped: list[float] = []
+    for v in sorted(values):
+        if not snapped or v - snapped[-1] > RULE_SNAP_TOLERANCE:
+            snapped.append(v)
+    return snapped
+
+
+def _has_edge(edges: list[float], y: float) -> bool:
+    return any(abs(e - y) <= RULE_SNAP_TOLERANCE for e in edges)
+
+
+class PdfiumPage:
+    """Page lue via l'API texte de pypdfium2, chargée à la première utilisation.
+
+    Les tableaux sont reconstruits à partir des traits (objets chemin fins) :
+    les traits verticaux donnent les colonnes, les traits horizontaux donnent
+    les bordures de cellules propres à chaque colonne. Une cellule fusionnée
+    sur plusieurs lignes apparaît en tête de la première et vaut ``None`` dans
+    les suivantes, comme avec pdfplumber.
+    """
+
+    def __init__(self, pdf: pdfium.PdfDocument, index: int) -> None:
+        self._pdf = pdf
+        self._index = index
+        self._page: pdfium.PdfPage | None = None
+        self._textpage: pdfium.PdfTextPage | None = None
+
+    def _load(self) -> tuple[pdfium.PdfPage, pdfium.PdfTextPage]:
+        if self._page is None or self._textpage is None:
+            self._page = self._pdf[self._index]
+            self._textpage = self._page.get_textpage()
+        return self._page, self._textpage
+
+    def extract_text(self) -> str | None:
+        _, textpage = self._load()
+        return textpage.get_text_range().replace("\r\n", "\n")
+
+    def _rules(self) -> tuple[list[Rule], list[Rule]]:
+        """Retourne les traits horizontaux (y, x0, x1) et verticaux (x, y0, y1)."""
+        page, _ = self._load()
+        horizontal: list[Rule] = []
+        vertical: list[Rule] = []
+        for obj in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_PATH]):
+            left, bottom, right, top = obj.get_bounds()
+            width, height = right - left, top - bottom
+            if height <= RULE_MAX_THICKNESS < width:
+                horizontal.append(((bottom + top) / 2, left, right))
+            elif width <= RULE_MAX_THICKNESS < height:
+                vertical.append(((left + right) / 2, bottom, top))
+        return horizontal, vertical
+
+    def extract_tables(self) -> list[Table]:
+        horizontal, vertical = self._rules()
+        if not vertical:
+            return []
+        _, textpage = self._load()
+
+        xs = _snap([x for x, _, _ in vertical])
+        y_min = min(y0 for _, y0, _ in vertical) - RULE_SNAP_TOLERANCE
+        y_max = max(y1 for _, _, y1 in vertical) + RULE_SNAP_TOLERANCE
+        columns = list(zip(xs, xs[1:]))
+
+        # Bordures horizontales propres à chaque colonne, de haut en bas (y PDF décroissant)
+        column_edges: list[list[float]] = []
+        for left, right in columns:
+            mid = (left + right) / 2
+            ys = [y for y, x0, x1 in horizontal if x0 <= mid <= x1 and y_min <= y <= y_max]
+            column_edges.append(_snap(ys)[::-1])
+
+        row_edges = _snap([y for edges in column_edges for y in edges])[::-1]
+        table: Table = []
+        for top in row_edges[:-1]:
+            row: list[str | None] = []
+            for (x0, x1), edges in zip(columns, column_edges):
+                if not _has_edge(edges, top):
+                    row.append(None)
+                    continue
+                below = [y for y in edges if y < top - RULE_SNAP_TOLERANCE]
+                if not below:
+                    row.append(None)
+                    continue
+                text = textpage.get_text_bounded(x0, below[0], x1, top)
+                row.append(text.replace("\r\n", "\n").strip())
+            table.append(row)
+        return [table] if table else []
+
+
+@contextmanager
+def open_pdfium(source: PdfSource) -> Iterator[Sequence[PdfPage]]:
+    """Ouvre le document avec pypdfium2 (extraction texte bas niveau, plus rapide)."""
+    pdf = pdfium.PdfDocument(source)
+    try:
+        yield [PdfiumPage(pdf, i) for i in range(len(pdf))]
+    finally:
+        pdf.close()
+
+
+BACKENDS: dict[str, PdfBackend] = {
+    "pdfplumber": open_pdfplumber,
+    "pdfium": open_pdfium,
+}
+
+
+def get_backend(name: str) -> PdfBackend:
+    """Retourne le moteur PDF enregistré sous ce nom."""
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        known = ", ".join(sorted(BACKENDS))
+        raise ValueError(f"Moteur PDF inconnu : {name} (disponibles : {known})") from None
+
+
+def parse_pdf_date(text: str) -> datetime.datetime | None:
+    """Convertit une date PDF (``D:20260209211051+01'00'``) en datetime UTC."""
+    m = PDF_DATE_RE.match(text.strip())
+    if not m:
+        return None
+    year, month, day, hour, minute, second, _, sign, off_h, off_m = m.groups()
+    offset = datetime.timedelta()
+    if sign:
+        offset = datetime.timedelta(hours=int(off_h), minutes=int(off_m or 0))
+        offset = -offset if sign == "-" else offset
+    try:
+        stamp = datetime.datetime(
+            int(year),
+            int(month or 1),
+            int(day or 1),
+            int(hour or 0),
+            int(minute or 0),
+            int(second or 0),
+            tzinfo=datetime.timezone(offset),
+        )
+    except ValueError:
+        return None
+    return stamp.astimezone(datetime.timezone.utc)
+
+
+def pdf_modified_at(source: PdfSource | bytes) -> datetime.datetime | None:
+    """Date de modification (à défaut de création) inscrite dans les métadonnées du PDF."""
+    try:
+        pdf = pdfium.PdfDocument(source)
+    except pdfium.PdfiumError:
+        return None
+    try:
+        metadata = pdf.get_metadata_dict(skip_empty=True)
+    finally:
+        pdf.close()
+    for key in ("ModDate", "CreationDate"):
+        stamp = parse_pdf_date(metadata.get(key, ""))
+        if stamp is not None:
+            return stamp
+    return None
@@ -0,0 +1,280 @@
+"""Publication des événements sur une collection CalDAV.
+
+Chaque événement devient une ressource ``<UID>.ics`` de la collection. Un
+fichier d'état local mémorise l'empreinte de chaque événement publié et les
+sources (PDF) qui le publient : seuls les événements nouveaux ou modifiés sont
+envoyés (PUT), et un événement disparu de la période publiée n'est supprimé
+(DELETE) que lorsque plus aucune source ne le publie. Les requêtes passent par
+un petit pool de connexions HTTP keep-alive et sont exécutées en parallèle,
+dans la limite de ``concurrency``.
+"""
+
+from __future__ import annotations
+
+import base64
+import datetime
+import hashlib
+import http.client
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, urlsplit
+
+from planning_to_ics.converter import EventData, event_digest
+from planning_to_ics.ics_writer import serialize_calendar
+from planning_to_ics.models import SchedulePeriod
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 30.0
+PUT_OK = {200, 201, 204}
+
+# Entrée d'état : {"digest": str, "dtstart": str ISO, "sources": [str, ...]}
+StateEntry = dict[str, Any]
+DELETE_OK = {200, 204, 404}
+
+
+class CalDavError(Exception):
+    """Erreur renvoyée par le serveur CalDAV."""
+
+
+class ConnectionPool:
+    """Connexions HTTP(S) keep-alive réutilisées vers l'hôte de la collection."""
+
+    def __init__(self, url: str, size: int, timeout: float = DEFAULT_TIMEOUT) -> None:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"URL CalDAV invalide : {url}")
+        self._scheme = parts.scheme
+        self._host = parts.hostname or ""
+        self._port = parts.port
+        self._timeout = timeout
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._lock:
+            self.opened += 1
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, self._port, timeout=self._timeout)
+        return http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+
+    def _send(
+        self,
+        conn: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+    ) -> tuple[int, bytes]:
+        """Envoie la requête, lit toute la réponse puis rend la connexion au pool."""
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except Exception:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        return response.status, data
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, bytes]:
+        """Exécute une requête sur une connexion du pool (ouverte au besoin)."""
+        headers = headers or {}
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._send(self._connect(), method, path, body, headers)
+        try:
+            return self._send(conn, method, path, body, headers)
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # Connexion keep-alive fermée par le serveur entre deux requêtes : on réessaie
+            return self._send(self._connect(), method, path, body, headers)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+@dataclass
+class PushResult:
+    """Bilan d'une publication."""
+
+    uploaded: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+
+def _resource_digest(event: EventData, revision: int) -> str:
+    return hashlib.sha256(f"{event_digest(event)}|{revision}".encode()).hexdigest()
+
+
+def _entry_sources(entry: StateEntry) -> set[str]:
+    """Sources d'une entrée ; les états plus anciens n'en ont qu'une, ou aucune.
+
+    Une entrée sans source connue n'est supprimée par personne tant qu'une
+    source ne l'a pas republiée.
+    """
+    if "sources" in entry:
+        return set(entry["sources"])
+    if "source" in entry:
+        return {entry["source"]}
+    return set()
+
+
+def _read_state(state_path: Path) -> dict[str, dict[str, StateEntry]]:
+    """Contenu du fichier d'état ; ValueError s'il est illisible (tronqué, modifié)."""
+    if not state_path.exists():
+        return {}
+    try:
+        data = json.loads(state_path.read_text())
+    except ValueError as e:
+        raise ValueError(f"Fichier d'état illisible : {state_path} ({e})") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"Fichier d'état illisible : {state_path}")
+    return data
+
+
+def _load_state(state_path: Path, collection_url: str) -> dict[str, StateEntry]:
+    return _read_state(state_path).get(collection_url, {})
+
+
+def _save_state(
+    state_path: Path, collection_url: str, entries: dict[str, StateEntry]
+) -> None:
+    data = _read_state(state_path)
+    data[collection_url] = entries
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_suffix(state_path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True))
+    tmp.replace(state_path)
+
+
+def _in_period(dtstart: str, period: SchedulePeriod) -> bool:
+    return period.start <= datetime.datetime.fromisoformat(dtstart).date() <= period.end
+
+
+def push_events(
+    events: list[EventData],
+    collection_url: str,
+    state_path: Path,
+    revision: int = 0,
+    period: SchedulePeriod | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    username: str | None = None,
+    password: str | None = None,
+    source: str = "",
+) -> PushResult:
+    """Publie les événements modifiés depuis la dernière publication.
+
+    Les événements déjà publiés qui n'apparaissent plus dans ``events`` sont
+    supprimés, mais seulement s'ils tombent dans ``period`` (par défaut les
+    dates couvertes par ``events``) ; ``source`` cesse alors de les publier, et
+    ils ne sont supprimés que si aucune autre source ne les publie encore.
+    Publier une semaine ne supprime donc pas les autres semaines, et publier
+    le PDF d'un enseignant ne supprime pas les cours d'un autre (ni un cours
+    commun aux deux) dans une collection partagée.
+    """
+    result = PushResult()
+    if period is None and events:
+        dates = [e.dtstart.date() for e in events]
+        period = SchedulePeriod(start=min(dates), end=max(dates))
+
+    base_path = urlsplit(collection_url).path.rstrip("/") + "/"
+    headers = {"Content-Type": "text/calendar; charset=utf-8"}
+    if username is not None:
+        token = base64.b64encode(f"{username}:{password or ''}".encode()).decode()
+        headers["Authorization"] = f"Basic {token}"
+
+    previous = _load_state(state_path, collection_url)
+    state = dict(previous)
+    current: dict[str, StateEntry] = {}
+    to_put = []
+    for e in events:
+        known = previous.get(e.uid, {})
+        current[e.uid] = {
+            "digest": _resource_digest(e, revision),
+            "dtstart": e.dtstart.isoformat(),
+            "sources": sorted(_entry_sources(known) | {source}),
+        }
+        if known.get("digest") == current[e.uid]["digest"]:
+            # Inchangé : rien à envoyer, mais la source en devient aussi propriétaire
+            state[e.uid] = current[e.uid]
+        else:
+            to_put.append(e)
+
+    to_delete = []
+    for uid, entry in previous.items():
+        if uid in current or period is None or not _in_period(entry["dtstart"], period):
+            continue
+        sources = _entry_sources(entry)
+        if source not in sources:
+            continue
+        remaining = sources - {source}
+        if remaining:
+            state[uid] = {**entry, "sources": sorted(remaining)}
+            state[uid].pop("source", None)
+        else:
+            to_delete.append(uid)
+    result.unchanged = len(events) - len(to_put)
+
+    pool = ConnectionPool(collection_url, size=concurrency)
+
+    def put(event: EventData) -> None:
+        body = serialize_calendar([event], revision)
+        path = base_path + quote(event.uid, safe="") + ".ics"
+        status, _ = pool.request("PUT", path, body, headers)
+        if status not in PUT_OK:
+            raise CalDavError(f"PUT {path} : HTTP {status}")
+
+    def delete(uid: str) -> None:
+        path = base_path + quote(uid, safe="") + ".ics"
+        status, _ = pool.request("DELETE", path, None, headers)
+        if status not in DELETE_OK:
+            raise CalDavError(f"DELETE {path} : HTTP {status}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            puts = {e.uid: executor.submit(put, e) for e in to_put}
+            deletes = {uid: executor.submit(delete, uid) for uid in to_delete}
+            for uid, future in puts.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    result.failed.append((uid, str(e)))
+                else:
+                    state[uid] = current[uid]
+                    result.uploaded.append(uid)
+            for uid, future in deletes.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    result.failed.append((uid, str(e)))
+                else:
+                    del state[uid]
+                    result.deleted.append(uid)
+    finally:
+        pool.close()
+        _save_state(state_path, collection_url, state)
+
+    return result
@@ -0,0 +1,287 @@
+"""Catalogue des calendriers générés dans le répertoire de sortie.
+
+Chaque fichier ``.ics`` produit est enregistré dans ``catalog.json`` avec sa
+période, l'empreinte du PDF source, son nombre d'événements et leurs UIDs. Un
+index d'intervalles sur les périodes permet de savoir quels calendriers
+couvrent une date, de repérer ceux qui sont entièrement remplacés par des
+générations plus récentes, et de fusionner les fichiers qui se recouvrent.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from icalendar import Calendar
+
+from planning_to_ics.converter import EventData
+from planning_to_ics.ics_writer import serialize_calendar, write_ics
+from planning_to_ics.models import SchedulePeriod
+from planning_to_ics.schedule_index import IntervalIndex
+
+CATALOG_FILENAME = "catalog.json"
+CATALOG_VERSION = 1
+FILENAME_RE = re.compile(r"esgcvak_(\d{4}-\d{2}-\d{2})_(\d{4}-\d{2}-\d{2})\.ics$")
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def ics_filename(period: SchedulePeriod | None) -> str:
+    """Génère le nom du fichier ICS : esgcvak_{debut}_{fin}.ics."""
+    if period:
+        return f"esgcvak_{period.start.isoformat()}_{period.end.isoformat()}.ics"
+    return "esgcvak_planning.ics"
+
+
+@dataclass
+class CatalogEntry:
+    """Un calendrier généré : fichier, période couverte et contenu."""
+
+    filename: str
+    start: datetime.date
+    end: datetime.date
+    source_digest: str
+    event_count: int
+    generated_at: datetime.datetime
+    uids: list[str] = field(default_factory=list)
+
+    def to_json(self) -> dict[str, object]:
+        data = asdict(self)
+        data["start"] = self.start.isoformat()
+        data["end"] = self.end.isoformat()
+        data["generated_at"] = self.generated_at.isoformat()
+        data["uids"] = sorted(self.uids)
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> CatalogEntry:
+        return cls(
+            filename=str(data["filename"]),
+            start=datetime.date.fromisoformat(str(data["start"])),
+            end=datetime.date.fromisoformat(str(data["end"])),
+            source_digest=str(data["source_digest"]),
+            event_count=int(data["event_count"]),  # type: ignore[call-overload]
+            generated_at=datetime.datetime.fromisoformat(str(data["generated_at"])),
+            uids=list(data.get("uids", [])),  # type: ignore[call-overload]
+        )
+
+
+def _read_events(path: Path) -> tuple[list[EventData], int, datetime.datetime | None]:
+    """Relit les VEVENT d'un fichier ICS généré.
+
+    Retourne aussi sa révision (SEQUENCE max) et sa date de génération
+    (DTSTAMP max), None si aucun VEVENT n'a de DTSTAMP.
+    """
+    cal = Calendar.from_ical(path.read_bytes())
+    events = []
+    revision = 0
+    dtstamp: datetime.datetime | None = None
+    for vevent in cal.walk("VEVENT"):
+        events.append(
+            EventData(
+                summary=str(vevent.get("SUMMARY", "")),
+                dtstart=vevent.decoded("DTSTART").replace(tzinfo=None),
+                dtend=vevent.decoded("DTEND").replace(tzinfo=None),
+                location=str(vevent.get("LOCATION", "")),
+                description=str(vevent.get("DESCRIPTION", "")),
+                uid=str(vevent.get("UID", "")),
+            )
+        )
+        revision = max(revision, int(vevent.get("SEQUENCE", 0)))
+        if "DTSTAMP" in vevent:
+            stamp = vevent.decoded("DTSTAMP")
+            dtstamp = stamp if dtstamp is None else max(dtstamp, stamp)
+    return events, revision, dtstamp
+
+
+class Catalog:
+    """Catalogue ``catalog.json`` d'un répertoire de sortie."""
+
+    def __init__(self, output_dir: Path) -> None:
+        self.output_dir = output_dir
+        self.path = output_dir / CATALOG_FILENAME
+        self.entries: dict[str, CatalogEntry] = {}
+        self._index: IntervalIndex[CatalogEntry] | None = None
+        if self.path.exists():
+            data = json.loads(self.path.read_text())
+            for item in data.get("calendars", []):
+                entry = CatalogEntry.from_json(item)
+                self.entries[entry.filename] = entry
+
+    def save(self) -> None:
+        data = {
+            "version": CATALOG_VERSION,
+            "calendars": [self.entries[name].to_json() for name in sorted(self.entries)],
+        }
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+        tmp.replace(self.path)
+
+    def _changed(self) -> None:
+        self._index = None
+
+    def record(
+        self,
+        ics_path: Path,
+        period: SchedulePeriod,
+        source_digest: str,
+        events: list[EventData],
+        generated_at: datetime.datetime | None = None,
+    ) -> CatalogEntry:
+        """Enregistre (ou remplace) le calendrier ``ics_path`` dans le catalogue."""
+        entry = CatalogEntry(
+            filename=ics_path.name,
+            start=period.start,
+            end=period.end,
+            source_digest=source_digest,
+            event_count=len(events),
+            generated_at=generated_at or datetime.datetime.now(datetime.timezone.utc),
+            uids=[e.uid for e in events],
+        )
+        self.entries[entry.filename] = entry
+        self._changed()
+        return entry
+
+    def remove(self, filename: str) -> None:
+        self.entries.pop(filename, None)
+        self._changed()
+
+    def missing(self) -> list[CatalogEntry]:
+        """Calendriers catalogués dont le fichier a disparu (supprimé ou renommé)."""
+        return sorted(
+            (e for e in self.entries.values() if not (self.output_dir / e.filename).exists()),
+            key=lambda e: (e.start, e.filename),
+        )
+
+    def prune(self) -> list[CatalogEntry]:
+        """Retire du catalogue les calendriers dont le fichier a disparu."""
+        removed = self.missing()
+        for entry in removed:
+            self.remove(entry.filename)
+        return removed
+
+    @property
+    def index(self) -> IntervalIndex[CatalogEntry]:
+        """Index des périodes (bornes incluses, stockées en [début, fin + 1 jour))."""
+        if self._index is None:
+            self._index = IntervalIndex(
+                (e.start, e.end + ONE_DAY, e) for e in self.entries.values()
+            )
+        return self._index
+
+    def covering(self, date: datetime.date) -> list[CatalogEntry]:
+        """Calendriers couvrant ``date``, du plus récent au plus ancien."""
+        found = self.index.covering(date)
+        return sorted(found, key=lambda e: e.generated_at, reverse=True)
+
+    def superseded(self) -> list[CatalogEntry]:
+        """Calendriers dont toute la période est couverte par des générations plus récentes."""
+        result = []
+        for entry in self.entries.values():
+            newer = sorted(
+                (e.start, e.end)
+                for e in self.index.overlapping(entry.start, entry.end + ONE_DAY)
+                if e is not entry and e.generated_at > entry.generated_at
+            )
+            covered_until = entry.start - ONE_DAY
+            for start, end in newer:
+                if start > covered_until + ONE_DAY:
+                    break
+                covered_until = max(covered_until, end)
+            if covered_until >= entry.end:
+                result.append(entry)
+        return sorted(result, key=lambda e: (e.start, e.filename))
+
+    def overlapping_groups(self) -> list[list[CatalogEntry]]:
+        """Groupes de calendriers dont les périodes se recouvrent (au moins deux par groupe)."""
+        groups: list[list[CatalogEntry]] = []
+        group_end: datetime.date | None = None
+        for entry in sorted(self.entries.values(), key=lambda e: (e.start, e.end)):
+            if group_end is not None and entry.start <= group_end:
+                groups[-1].append(entry)
+                group_end = max(group_end, entry.end)
+            else:
+                groups.append([entry])
+                group_end = entry.end
+        return [g for g in groups if len(g) > 1]
+
+    def compact(self, group: list[CatalogEntry]) -> CatalogEntry:
+        """Fusionne un groupe de calendriers qui se recouvrent en un seul fichier.
+
+        Pour chaque jour, les événements du calendrier le plus récent couvrant
+        ce jour l'emportent. Le fichier fusionné garde la date de génération
+        (et le DTSTAMP) du plus récent. Les fichiers d'origine sont supprimés.
+
+        Lève FileNotFoundError, sans rien modifier, si un fichier du groupe a
+        disparu : ``rebuild`` le retire alors du catalogue.
+        """
+        absent = [e.filename for e in group if not (self.output_dir / e.filename).exists()]
+        if absent:
+            raise FileNotFoundError(
+                f"Calendriers catalogués introuvables : {', '.join(absent)}"
+                " (lancer « catalog rebuild »)"
+            )
+        merged: dict[str, EventData] = {}
+        revision = 0
+        # À date égale, la période la plus courte (régénération ciblée) l'emporte
+        for entry in sorted(group, key=lambda e: (e.generated_at, e.start - e.end)):
+            events, rev, _ = _read_events(self.output_dir / entry.filename)
+            revision = max(revision, rev)
+            # Le calendrier plus récent fait autorité sur toute sa période
+            merged = {
+                uid: e
+                for uid, e in merged.items()
+                if not entry.start <= e.dtstart.date() <= entry.end
+            }
+            merged.update((e.uid, e) for e in events)
+
+        period = SchedulePeriod(
+            start=min(e.start for e in group), end=max(e.end for e in group)
+        )
+        events = list(merged.values())
+        generated_at = max(e.generated_at for e in group)
+        ics_path = self.output_dir / ics_filename(period)
+        write_ics(serialize_calendar(events, revision, dtstamp=generated_at), ics_path)
+
+        for entry in group:
+            if entry.filename != ics_path.name:
+                (self.output_dir / entry.filename).unlink(missing_ok=True)
+            self.remove(entry.filename)
+
+        digest = hashlib.sha256(
+            "".join(sorted(e.source_digest for e in group)).encode()
+        ).hexdigest()
+        return self.record(ics_path, period, digest, events, generated_at=generated_at)
+
+    def rebuild(self) -> list[CatalogEntry]:
+        """Ajoute au catalogue les fichiers ``.ics`` du répertoire qui n'y figurent pas.
+
+        Les entrées dont le fichier a disparu sont d'abord retirées (voir
+        ``prune``), si bien qu'un fichier renommé est catalogué sous son
+        nouveau nom. La période est lue dans le nom du fichier et la date de génération dans
+        les DTSTAMP des événements ; la date de modification du fichier, qui ne
+        survit pas à une copie ou à un checkout, ne sert qu'en dernier recours.
+        L'empreinte du PDF source est inconnue (vide).
+        """
+        self.prune()
+        added = []
+        for path in sorted(self.output_dir.glob("*.ics")):
+            m = FILENAME_RE.search(path.name)
+            if path.name in self.entries or not m:
+                continue
+            events, _, generated_at = _read_events(path)
+            period = SchedulePeriod(
+                start=datetime.date.fromisoformat(m.group(1)),
+                end=datetime.date.fromisoformat(m.group(2)),
+            )
+            if generated_at is None:
+                generated_at = datetime.datetime.fromtimestamp(
+                    path.stat().st_mtime, datetime.timezone.utc
+                )
+            added.append(self.record(path, period, "", events, generated_at=generated_at))
+        return added
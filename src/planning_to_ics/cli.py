@@ -4,13 +4,32 @@ from __future__ import annotations
 
 import argparse
 import datetime
+import hashlib
+import os
 import sys
+from contextlib import nullcontext
 from pathlib import Path
+from typing import NoReturn
 
-from planning_to_ics.converter import convert_slot
-from planning_to_ics.extractor import extract_courses
-from planning_to_ics.ics_writer import CALNAME, build_calendar, write_ics
+from planning_to_ics.backends import BACKENDS, DEFAULT_BACKEND
+from planning_to_ics.caldav import DEFAULT_CONCURRENCY, push_events
+from planning_to_ics.catalog import Catalog, CatalogEntry, ics_filename
+from planning_to_ics.converter import EventData, convert_slot
+from planning_to_ics.ics_writer import (
+    CALNAME,
+    reproducible_dtstamp,
+    serialize_calendar,
+    write_ics,
+)
 from planning_to_ics.models import CourseSlot, SchedulePeriod
+from planning_to_ics.render_cache import FragmentCache, default_cache_path
+from planning_to_ics.schedule_index import ScheduledSlot, ScheduleIndex
+from planning_to_ics.sources import (
+    PdfInput,
+    extract_inputs,
+    merge_extractions,
+    read_pdf_inputs,
+)
 
 DAYS_FR = ["Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim"]
 
@@ -28,13 +47,6 @@ def _summary_short(slot: CourseSlot, max_name: int = 25) -> str:
     return f"[{slot.class_group}] {name}{typ}"
 
 
-def _ics_filename(period: SchedulePeriod | None) -> str:
-    """Génère le nom du fichier ICS : esgcvak_{debut}_{fin}.ics."""
-    if period:
-        return f"esgcvak_{period.start.isoformat()}_{period.end.isoformat()}.ics"
-    return "esgcvak_planning.ics"
-
-
 def _print_summary(
     courses: list[CourseSlot],
     period: SchedulePeriod | None,
@@ -42,6 +54,7 @@ def _print_summary(
     ics_path: Path,
     revision: int,
     dry_run: bool = False,
+    written: bool = True,
 ) -> None:
     """Affiche le résumé des cours trouvés."""
     print(f"\n📄 Lecture de {pdf_name}...")
@@ -63,6 +76,8 @@ def _print_summary(
 
     if dry_run:
         print("\n🔍 Mode dry-run : aucun fichier généré.")
+    elif not written:
+        print(f"\n✅ Fichier inchangé : {ics_path}")
     else:
         print(f"\n✅ Fichier généré : {ics_path}")
         print("   Rappels : 2 jours, 1 jour, 30 min avant chaque cours")
@@ -70,11 +85,440 @@ def _print_summary(
         print(f"   Révision : {revision}")
 
 
-def main() -> None:
+def _parse_date_arg(text: str) -> datetime.date:
+    """Parse une date en ligne de commande : JJ/MM/AAAA ou AAAA-MM-JJ."""
+    try:
+        if "/" in text:
+            d, m, y = text.split("/")
+            return datetime.date(int(y), int(m), int(d))
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide : {text}") from None
+
+
+def _parse_timestamp_arg(text: str) -> datetime.datetime:
+    """Parse un horodatage ISO 8601 (UTC si aucun fuseau n'est précisé)."""
+    try:
+        stamp = datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"horodatage invalide : {text}") from None
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=datetime.timezone.utc)
+    return stamp
+
+
+def _parse_positive_int(text: str) -> int:
+    """Parse un entier strictement positif (nombre de processus, de requêtes)."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"entier positif attendu : {text}")
+    return value
+
+
+def _resolve_dtstamp(
+    args: argparse.Namespace, inputs: list[PdfInput]
+) -> datetime.datetime | None:
+    """DTSTAMP du mode reproductible : --timestamp, SOURCE_DATE_EPOCH, date du PDF.
+
+    La date du PDF est celle de ses métadonnées (ModDate, sinon CreationDate ;
+    la plus récente pour une archive). Sans métadonnées, le DTSTAMP est dérivé
+    de l'empreinte du PDF. Retourne None hors mode reproductible (DTSTAMP =
+    maintenant).
+    """
+    if args.timestamp is not None:
+        return args.timestamp
+    if not args.reproducible:
+        return None
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        try:
+            return datetime.datetime.fromtimestamp(int(epoch), tz=datetime.timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            _fail(f"SOURCE_DATE_EPOCH invalide : {epoch}", args.verbose)
+    dates = [pdf.modified_at for pdf in inputs if pdf.modified_at is not None]
+    if dates:
+        return max(dates)
+    return reproducible_dtstamp(_source_digest(inputs))
+
+
+def _source_digest(inputs: list[PdfInput]) -> str:
+    """Empreinte de la source : celle du PDF, ou combinée pour une archive."""
+    if len(inputs) == 1:
+        return inputs[0].digest
+    return hashlib.sha256("".join(pdf.digest for pdf in inputs).encode()).hexdigest()
+
+
+def _fail(message: str, verbose: bool) -> NoReturn:
+    print(f"❌ {message}", file=sys.stderr)
+    if verbose:
+        import traceback
+
+        traceback.print_exc()
+    sys.exit(1)
+
+
+def _read_inputs(path: Path, verbose: bool) -> list[PdfInput]:
+    """Lit les PDF d'un fichier, d'une archive ZIP ou d'un export mail, ou quitte."""
+    if not path.exists():
+        print(f"❌ Fichier introuvable : {path}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        inputs = read_pdf_inputs(path)
+    except Exception as e:
+        _fail(f"Erreur lors de la lecture de {path.name} : {e}", verbose)
+
+    if not inputs:
+        print(f"❌ Aucun PDF trouvé dans {path.name}.", file=sys.stderr)
+        sys.exit(1)
+    return inputs
+
+
+def _extract_inputs(
+    inputs: list[PdfInput], args: argparse.Namespace
+) -> list[tuple[list[CourseSlot], SchedulePeriod | None]]:
+    """Extrait les cours de chaque PDF, ou quitte avec un message d'erreur."""
+    try:
+        return extract_inputs(
+            inputs,
+            backend=args.backend,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            workers=args.workers,
+        )
+    except Exception as e:
+        _fail(f"Erreur lors de la lecture du PDF : {e}", args.verbose)
+
+
+def _load_courses(
+    path: Path, args: argparse.Namespace
+) -> tuple[list[PdfInput], list[CourseSlot], SchedulePeriod | None]:
+    """Lit et extrait tous les PDF de ``path``, fusionnés en une seule liste de cours."""
+    inputs = _read_inputs(path, args.verbose)
+    results = _extract_inputs(inputs, args)
+    courses, period = merge_extractions(results, sources=[pdf.stem for pdf in inputs])
+    return inputs, courses, period
+
+
+def _source_label(path: Path, inputs: list[PdfInput]) -> str:
+    if len(inputs) == 1 and inputs[0].name == path.name:
+        return path.name
+    return f"{path.name} ({len(inputs)} PDF)"
+
+
+def _add_workers_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--workers",
+        type=_parse_positive_int,
+        default=os.cpu_count() or 1,
+        help="Processus pour l'extraction des PDF et la sérialisation (défaut: nb de cœurs)",
+    )
+
+
+def _add_backend_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f"Moteur de lecture PDF (défaut: {DEFAULT_BACKEND})",
+    )
+
+
+def _add_window_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        type=_parse_date_arg,
+        help="Ignore les cours avant cette date (JJ/MM/AAAA ou AAAA-MM-JJ)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        type=_parse_date_arg,
+        help="Ignore les cours après cette date (JJ/MM/AAAA ou AAAA-MM-JJ)",
+    )
+
+
+def _build_index(args: argparse.Namespace) -> ScheduleIndex:
+    """Indexe les créneaux de plusieurs PDF (un PDF par enseignant)."""
+    inputs = [pdf for path in args.pdfs for pdf in _read_inputs(Path(path), args.verbose)]
+    index = ScheduleIndex()
+    for pdf, (courses, _) in zip(inputs, _extract_inputs(inputs, args)):
+        index.add(courses, teacher=pdf.stem)
+    return index
+
+
+def _format_entry(entry: ScheduledSlot) -> str:
+    c = entry.slot
+    dm = c.date.strftime("%d/%m")
+    start = c.start_time.strftime("%H:%M")
+    end = c.end_time.strftime("%H:%M")
+    return f"{_day_abbr(c.date)} {dm}  {start}-{end}  {_summary_short(c)}  {c.room}"
+
+
+def _cmd_query(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="planning.py query",
+        description="Interroge les créneaux de un ou plusieurs PDF EasyLMD.",
+    )
+    parser.add_argument("pdfs", nargs="+", help="PDF EasyLMD, .zip, .eml ou .mbox")
+    parser.add_argument("--date", type=_parse_date_arg, help="Jour (JJ/MM/AAAA ou AAAA-MM-JJ)")
+    parser.add_argument("--room", help="Salle, ex. S-301")
+    parser.add_argument("--group", help="Classe, ex. GI-L2")
+    parser.add_argument("--teacher", help="Enseignant (nom du fichier PDF sans extension)")
+    _add_window_arguments(parser)
+    _add_workers_argument(parser)
+    _add_backend_argument(parser)
+    parser.add_argument("--verbose", action="store_true", help="Affiche les erreurs détaillées")
+    args = parser.parse_args(argv)
+
+    index = _build_index(args)
+    found = index.query(date=args.date, room=args.room, group=args.group, teacher=args.teacher)
+
+    print(f"\n🔎 {len(found)} créneaux trouvés")
+    for entry in found:
+        print(f"  {_format_entry(entry)}  ({entry.teacher})")
+
+
+def _cmd_conflicts(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="planning.py conflicts",
+        description="Détecte les salles, classes et enseignants doublement réservés.",
+    )
+    parser.add_argument("pdfs", nargs="+", help="PDF EasyLMD, .zip, .eml ou .mbox")
+    _add_window_arguments(parser)
+    _add_workers_argument(parser)
+    _add_backend_argument(parser)
+    parser.add_argument("--verbose", action="store_true", help="Affiche les erreurs détaillées")
+    args = parser.parse_args(argv)
+
+    index = _build_index(args)
+    conflicts = index.conflicts()
+
+    if not conflicts:
+        print(f"\n✅ Aucun conflit sur {len(index)} créneaux.")
+        return
+
+    print(f"\n⚠️  {len(conflicts)} conflits sur {len(index)} créneaux")
+    for conflict in conflicts:
+        print(f"\n  {conflict.kind.capitalize()} {conflict.key} :")
+        for entry in (conflict.first, conflict.second):
+            print(f"    {_format_entry(entry)}  ({entry.teacher})")
+    sys.exit(1)
+
+
+def _cmd_push(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="planning.py push",
+        description="Publie les cours d'un PDF EasyLMD sur une collection CalDAV.",
+        epilog="Le mot de passe est lu dans la variable d'environnement CALDAV_PASSWORD.",
+    )
+    parser.add_argument("pdf", help="Fichier PDF EasyLMD, archive .zip ou export mail .eml/.mbox")
+    parser.add_argument("--url", required=True, help="URL de la collection CalDAV")
+    parser.add_argument("--user", help="Utilisateur CalDAV (authentification Basic)")
+    parser.add_argument(
+        "--source",
+        help=(
+            "Nom de la source des cours (défaut: nom du fichier sans extension) ;"
+            " seuls les cours publiés depuis la même source peuvent être supprimés"
+        ),
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=Path("output") / "caldav_state.json",
+        help="Fichier d'état des publications (défaut: ./output/caldav_state.json)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=_parse_positive_int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Requêtes simultanées (défaut: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--revision",
+        type=int,
+        default=0,
+        help="Numéro de séquence pour les mises à jour (défaut: 0)",
+    )
+    _add_window_arguments(parser)
+    _add_workers_argument(parser)
+    _add_backend_argument(parser)
+    parser.add_argument("--verbose", action="store_true", help="Affiche les erreurs détaillées")
+    args = parser.parse_args(argv)
+
+    pdf_path = Path(args.pdf)
+    inputs, courses, period = _load_courses(pdf_path, args)
+    if not courses:
+        print("❌ Aucun cours trouvé dans le PDF.", file=sys.stderr)
+        sys.exit(1)
+
+    events = [convert_slot(c) for c in courses]
+    try:
+        result = push_events(
+            events,
+            args.url,
+            args.state,
+            revision=args.revision,
+            period=period,
+            concurrency=args.concurrency,
+            username=args.user,
+            password=os.environ.get("CALDAV_PASSWORD"),
+            source=args.source or pdf_path.stem,
+        )
+    except (ValueError, OSError) as e:
+        _fail(str(e), args.verbose)
+
+    print(f"\n📤 Publication de {_source_label(pdf_path, inputs)} sur {args.url}")
+    print(f"   Envoyés : {len(result.uploaded)}")
+    print(f"   Supprimés : {len(result.deleted)}")
+    print(f"   Inchangés : {result.unchanged}")
+    if result.failed:
+        print(f"\n❌ {len(result.failed)} échecs :", file=sys.stderr)
+        for uid, error in result.failed:
+            print(f"   {uid} : {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _record_output(
+    output_dir: Path,
+    ics_path: Path,
+    period: SchedulePeriod,
+    digest: str,
+    events: list[EventData],
+    written: bool,
+) -> None:
+    """Enregistre le calendrier généré dans le catalogue du répertoire de sortie."""
+    catalog = Catalog(output_dir)
+    known = catalog.entries.get(ics_path.name)
+    # Fichier inchangé : on garde la date de génération d'origine
+    if not written and known is not None and known.source_digest == digest:
+        return
+    catalog.record(ics_path, period, digest, events)
+    catalog.save()
+    superseded = [e.filename for e in catalog.superseded()]
+    if superseded:
+        print(f"\nℹ️  {len(superseded)} calendriers remplacés par des générations récentes :")
+        for name in superseded:
+            print(f"   {name}")
+        print("   (voir planning.py catalog superseded --delete ou catalog compact)")
+
+
+def _format_catalog_entry(entry: CatalogEntry, missing: bool = False) -> str:
+    start = entry.start.strftime("%d/%m/%Y")
+    end = entry.end.strftime("%d/%m/%Y")
+    generated = entry.generated_at.astimezone().strftime("%d/%m/%Y %H:%M")
+    line = (
+        f"{entry.filename}  {start} → {end}  {entry.event_count} cours"
+        f"  (généré le {generated})"
+    )
+    return f"{line}  ⚠️  fichier introuvable" if missing else line
+
+
+def _print_catalog_entries(catalog: Catalog, entries: list[CatalogEntry]) -> None:
+    """Affiche des entrées du catalogue en signalant les fichiers disparus."""
+    missing = {e.filename for e in catalog.missing()}
+    for entry in entries:
+        print(f"  {_format_catalog_entry(entry, entry.filename in missing)}")
+    if missing.intersection(e.filename for e in entries):
+        print("   Fichiers supprimés ou renommés : lancer « catalog rebuild ».")
+
+
+def _cmd_catalog(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="planning.py catalog",
+        description="Catalogue des calendriers générés dans le répertoire de sortie.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("output"),
+        help="Répertoire de sortie (défaut: ./output/)",
+    )
+    actions = parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("list", help="Liste les calendriers catalogués")
+    covers = actions.add_parser("covers", help="Calendriers couvrant une date")
+    covers.add_argument("date", type=_parse_date_arg, help="Jour (JJ/MM/AAAA ou AAAA-MM-JJ)")
+    superseded = actions.add_parser(
+        "superseded", help="Calendriers entièrement couverts par des générations plus récentes"
+    )
+    superseded.add_argument("--delete", action="store_true", help="Supprime ces fichiers")
+    actions.add_parser("compact", help="Fusionne les calendriers dont les périodes se recouvrent")
+    actions.add_parser(
+        "rebuild",
+        help="Ajoute les .ics non catalogués et retire les fichiers disparus",
+    )
+    args = parser.parse_args(argv)
+
+    catalog = Catalog(args.output_dir)
+
+    if args.action == "list":
+        entries = sorted(catalog.entries.values(), key=lambda e: (e.start, e.filename))
+        print(f"\n🗂️  {len(entries)} calendriers dans {args.output_dir}")
+        _print_catalog_entries(catalog, entries)
+
+    elif args.action == "covers":
+        found = catalog.covering(args.date)
+        print(f"\n🔎 {len(found)} calendriers couvrent le {args.date.strftime('%d/%m/%Y')}")
+        _print_catalog_entries(catalog, found)
+
+    elif args.action == "superseded":
+        found = catalog.superseded()
+        if not found:
+            print("\n✅ Aucun calendrier remplacé.")
+            return
+        print(f"\n🗑️  {len(found)} calendriers remplacés")
+        for entry in found:
+            print(f"  {_format_catalog_entry(entry)}")
+            if args.delete:
+                (args.output_dir / entry.filename).unlink(missing_ok=True)
+                catalog.remove(entry.filename)
+        if args.delete:
+            catalog.save()
+            print("   Fichiers supprimés.")
+
+    elif args.action == "compact":
+        groups = catalog.overlapping_groups()
+        if not groups:
+            print("\n✅ Aucun calendrier ne se recouvre.")
+            return
+        try:
+            for group in groups:
+                merged = catalog.compact(group)
+                print(f"\n📦 {len(group)} calendriers fusionnés → {merged.filename}")
+                for entry in group:
+                    print(f"   {entry.filename}")
+        except FileNotFoundError as e:
+            _fail(str(e), False)
+        finally:
+            # Les groupes déjà fusionnés restent enregistrés
+            catalog.save()
+
+    elif args.action == "rebuild":
+        removed = catalog.prune()
+        added = catalog.rebuild()
+        catalog.save()
+        if removed:
+            print(f"\n🗑️  {len(removed)} calendriers introuvables retirés du catalogue")
+            for entry in removed:
+                print(f"  {entry.filename}")
+        print(f"\n🗂️  {len(added)} calendriers ajoutés au catalogue")
+        for entry in added:
+            print(f"  {_format_catalog_entry(entry)}")
+
+
+def _cmd_convert(argv: list[str]) -> None:
     parser = argparse.ArgumentParser(
         description="Convertit un emploi du temps PDF EasyLMD en fichier ICS.",
+        epilog=(
+            "Autres commandes : query, conflicts, push, catalog"
+            " (voir planning.py <commande> --help)."
+        ),
     )
-    parser.add_argument("pdf", help="Chemin vers le fichier PDF EasyLMD")
+    parser.add_argument("pdf", help="Fichier PDF EasyLMD, archive .zip ou export mail .eml/.mbox")
     parser.add_argument(
         "--output-dir",
         type=Path,
@@ -92,27 +536,36 @@ def main() -> None:
         action="store_true",
         help="Affiche les cours extraits sans générer le .ics",
     )
+    _add_workers_argument(parser)
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Sortie identique octet pour octet pour un même PDF (DTSTAMP déterministe)",
+    )
+    parser.add_argument(
+        "--timestamp",
+        type=_parse_timestamp_arg,
+        help="DTSTAMP imposé, ISO 8601 (implique --reproducible)",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        type=Path,
+        const=default_cache_path(),
+        metavar="FICHIER",
+        help=f"Réutilise les VEVENT déjà rendus (défaut: {default_cache_path()})",
+    )
+    _add_window_arguments(parser)
+    _add_backend_argument(parser)
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Affiche les détails de parsing (debug)",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     pdf_path = Path(args.pdf)
-    if not pdf_path.exists():
-        print(f"❌ Fichier introuvable : {pdf_path}", file=sys.stderr)
-        sys.exit(1)
-
-    try:
-        courses, period = extract_courses(pdf_path)
-    except Exception as e:
-        print(f"❌ Erreur lors de la lecture du PDF : {e}", file=sys.stderr)
-        if args.verbose:
-            import traceback
-
-            traceback.print_exc()
-        sys.exit(1)
+    inputs, courses, period = _load_courses(pdf_path, args)
 
     if not courses:
         print("❌ Aucun cours trouvé dans le PDF.", file=sys.stderr)
@@ -123,14 +576,46 @@ def main() -> None:
         for c in courses:
             print(f"  {c}")
 
-    ics_path = args.output_dir / _ics_filename(period)
+    ics_path = args.output_dir / ics_filename(period)
 
+    written = False
     if not args.dry_run:
         events = [convert_slot(c) for c in courses]
-        cal = build_calendar(events, args.revision)
-        write_ics(cal, ics_path)
+        digest = _source_digest(inputs)
+        dtstamp = _resolve_dtstamp(args, inputs)
+        with FragmentCache(args.cache) if args.cache else nullcontext() as cache:
+            data = serialize_calendar(
+                events, args.revision, dtstamp=dtstamp, workers=args.workers, cache=cache
+            )
+        written = write_ics(data, ics_path)
+        if period is not None:
+            _record_output(args.output_dir, ics_path, period, digest, events, written)
+
+    _print_summary(
+        courses,
+        period,
+        _source_label(pdf_path, inputs),
+        ics_path,
+        args.revision,
+        args.dry_run,
+        written,
+    )
 
-    _print_summary(courses, period, pdf_path.name, ics_path, args.revision, args.dry_run)
+
+COMMANDS = {
+    "query": _cmd_query,
+    "conflicts": _cmd_conflicts,
+    "push": _cmd_push,
+    "catalog": _cmd_catalog,
+}
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+    else:
+        _cmd_convert(argv)
 
 
 if __name__ == "__main__":
@@ -36,6 +36,21 @@ def compute_uid(slot: CourseSlot) -> str:
     return hashlib.sha256(raw.encode()).hexdigest()[:16] + "@esgcvak.com"
 
 
+def event_digest(event: EventData) -> str:
+    """Empreinte du contenu d'un EventData : change dès qu'un champ change."""
+    raw = "|".join(
+        [
+            event.uid,
+            event.summary,
+            event.dtstart.isoformat(),
+            event.dtend.isoformat(),
+            event.location,
+            event.description,
+        ]
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
 def format_summary(slot: CourseSlot) -> str:
     """Compose le SUMMARY : [Classe] Nom du cours (Type)."""
     if slot.course_type:
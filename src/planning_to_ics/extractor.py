@@ -1,13 +1,13 @@
-"""Extraction et parsing des emplois du temps PDF EasyLMD via pdfplumber."""
+"""Extraction et parsing des emplois du temps PDF EasyLMD (moteur PDF interchangeable)."""
 
 from __future__ import annotations
 
 import datetime
 import re
+from collections.abc import Sequence
 from pathlib import Path
 
-import pdfplumber
-
+from planning_to_ics.backends import DEFAULT_BACKEND, PdfPage, PdfSource, get_backend
 from planning_to_ics.models import CourseSlot, SchedulePeriod
 
 DATE_RE = re.compile(r"(\d{2}/\d{2}/\d{4})")
@@ -60,9 +60,15 @@ def _parse_course_name(raw: str) -> tuple[str, str]:
     return raw, ""
 
 
-def _extract_period(pdf: pdfplumber.PDF) -> SchedulePeriod | None:
-    """Extrait la période 'du JJ/MM/AAAA au JJ/MM/AAAA' depuis le texte du PDF."""
-    for page in pdf.pages:
+def _extract_period(
+    pages: Sequence[PdfPage], max_pages: int | None = None
+) -> SchedulePeriod | None:
+    """Extrait la période 'du JJ/MM/AAAA au JJ/MM/AAAA' depuis le texte du PDF.
+
+    ``max_pages`` limite la recherche aux premières pages (l'en-tête EasyLMD
+    est en tête de la première).
+    """
+    for page in pages[:max_pages]:
         text = page.extract_text() or ""
         m = PERIOD_RE.search(text)
         if m:
@@ -73,23 +79,59 @@ def _extract_period(pdf: pdfplumber.PDF) -> SchedulePeriod | None:
     return None
 
 
-def extract_courses(pdf_path: str | Path) -> tuple[list[CourseSlot], SchedulePeriod | None]:
+def _clip_period(
+    period: SchedulePeriod,
+    date_from: datetime.date | None,
+    date_to: datetime.date | None,
+) -> SchedulePeriod | None:
+    """Restreint la période à la fenêtre demandée (None si elles sont disjointes)."""
+    start = max(period.start, date_from) if date_from else period.start
+    end = min(period.end, date_to) if date_to else period.end
+    return SchedulePeriod(start=start, end=end) if start <= end else None
+
+
+def extract_courses(
+    pdf_path: PdfSource,
+    backend: str = DEFAULT_BACKEND,
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+) -> tuple[list[CourseSlot], SchedulePeriod | None]:
     """Extrait tous les créneaux de cours du PDF.
 
     Gère les cellules fusionnées (propagation de la dernière date non-vide),
-    le texte multi-lignes, et les tableaux multi-pages.
+    le texte multi-lignes, et les tableaux multi-pages. ``backend`` choisit le
+    moteur PDF (voir ``planning_to_ics.backends.BACKENDS``). ``pdf_path`` peut
+    aussi être un flux binaire (PDF lu en mémoire, pièce jointe, archive).
+
+    ``date_from`` / ``date_to`` (bornes incluses) filtrent les créneaux dès la
+    lecture : les lignes hors fenêtre sont écartées avant tout parsing de
+    l'horaire et du cours. Les tableaux EasyLMD étant triés par date, les
+    pages suivantes ne sont plus lues une fois la fenêtre dépassée, sauf si un
+    retour en arrière des dates a été observé. La période n'est alors cherchée
+    que sur la première page ; sans en-tête, elle est déduite des dates des
+    créneaux retenus. La période retournée est restreinte à la fenêtre.
 
     Returns:
         (liste_de_cours, période) — période est None si non trouvée dans le PDF.
     """
-    pdf_path = Path(pdf_path)
+    if isinstance(pdf_path, str):
+        pdf_path = Path(pdf_path)
     courses: list[CourseSlot] = []
 
-    with pdfplumber.open(pdf_path) as pdf:
-        period = _extract_period(pdf)
+    with get_backend(backend)(pdf_path) as pages:
+        windowed = date_from is not None or date_to is not None
+        period = _extract_period(pages, max_pages=1 if windowed else None)
+        if period is not None and windowed:
+            period = _clip_period(period, date_from, date_to)
+            if period is None:
+                return [], None
+
         last_date_str: str | None = None
+        row_date: datetime.date | None = None
+        max_date: datetime.date | None = None
+        dates_ordered = True
 
-        for page in pdf.pages:
+        for page in pages:
             for table in page.extract_tables():
                 for row in table:
                     if not row or len(row) < 5:
@@ -101,12 +143,18 @@ def extract_courses(pdf_path: str | Path) -> tuple[list[CourseSlot], SchedulePer
 
                     # Extraire ou propager la date (cellules fusionnées)
                     date_str = _extract_date(row[0])
-                    if date_str:
+                    if date_str and date_str != last_date_str:
                         last_date_str = date_str
-                    else:
-                        date_str = last_date_str
+                        row_date = _parse_date_fr(date_str)
+                        if max_date and row_date < max_date:
+                            dates_ordered = False
+                        max_date = max(max_date or row_date, row_date)
+
+                    if row_date is None:
+                        continue
 
-                    if not date_str:
+                    # Fenêtre de dates : rejet avant tout parsing coûteux
+                    if (date_from and row_date < date_from) or (date_to and row_date > date_to):
                         continue
 
                     # Parser l'horaire
@@ -131,7 +179,7 @@ def extract_courses(pdf_path: str | Path) -> tuple[list[CourseSlot], SchedulePer
 
                     courses.append(
                         CourseSlot(
-                            date=_parse_date_fr(date_str),
+                            date=row_date,
                             start_time=times[0],
                             end_time=times[1],
                             course_name=course_name,
@@ -141,6 +189,10 @@ def extract_courses(pdf_path: str | Path) -> tuple[list[CourseSlot], SchedulePer
                         )
                     )
 
+            # Tableau trié et fenêtre dépassée : les pages suivantes sont hors fenêtre
+            if date_to and dates_ordered and max_date and max_date > date_to:
+                break
+
     # Fallback : déduire la période des dates min/max si non trouvée dans le PDF
     if period is None and courses:
         dates = [c.date for c in courses]
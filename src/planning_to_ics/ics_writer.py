@@ -2,16 +2,47 @@
 
 from __future__ import annotations
 
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
 
+import icalendar
 from icalendar import Alarm, Calendar, Event, Timezone, TimezoneStandard
 
-from planning_to_ics.converter import EventData
+from planning_to_ics.converter import EventData, event_digest
+from planning_to_ics.render_cache import FragmentCache
 
 TIMEZONE_ID = "Africa/Porto-Novo"
 PRODID = "-//ESGC-VAK//Planning//FR"
 CALNAME = "Cours"
+EVENT_STATUS = "CONFIRMED"
+EVENT_TRANSP = "OPAQUE"
+
+# Version du rendu des VEVENT, incluse dans la clé des fragments en cache :
+# à incrémenter à chaque modification de _build_event ou _build_alarms.
+RENDER_VERSION = 1
+
+# En dessous de ce nombre d'événements, le coût du pool de processus dépasse le gain.
+PARALLEL_THRESHOLD = 500
+CHUNK_SIZE = 250
+CALENDAR_FOOTER = b"END:VCALENDAR\r\n"
+
+# Rappels ajoutés à chaque cours : (décalage, texte)
+ALARMS = (
+    (timedelta(days=-2), "Cours dans 2 jours"),
+    (timedelta(days=-1), "Cours demain"),
+    (timedelta(minutes=-30), "Cours dans 30 minutes"),
+)
+
+# DTSTAMP provisoire des fragments mis en cache, remplacé à l'assemblage
+FRAGMENT_DTSTAMP = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Mode reproductible, PDF sans date dans ses métadonnées : DTSTAMP dérivé de
+# l'empreinte du PDF, dans l'année qui suit cette date
+REPRODUCIBLE_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+REPRODUCIBLE_SPAN = timedelta(days=366)
 
 
 def _build_timezone() -> Timezone:
@@ -32,11 +63,7 @@ def _build_timezone() -> Timezone:
 def _build_alarms() -> list[Alarm]:
     """Construit les 3 rappels : 2 jours, 1 jour, 30 min avant."""
     alarms = []
-    for td, desc in [
-        (timedelta(days=-2), "Cours dans 2 jours"),
-        (timedelta(days=-1), "Cours demain"),
-        (timedelta(minutes=-30), "Cours dans 30 minutes"),
-    ]:
+    for td, desc in ALARMS:
         alarm = Alarm()
         alarm.add("ACTION", "DISPLAY")
         alarm.add("DESCRIPTION", desc)
@@ -46,7 +73,10 @@ def _build_alarms() -> list[Alarm]:
 
 
 def _build_event(event_data: EventData, revision: int, dtstamp: datetime) -> Event:
-    """Construit un VEVENT à partir d'un EventData."""
+    """Construit un VEVENT à partir d'un EventData.
+
+    Toute modification du rendu doit incrémenter RENDER_VERSION.
+    """
     event = Event()
     event.add("SUMMARY", event_data.summary)
     event.add("DTSTART", event_data.dtstart, parameters={"TZID": TIMEZONE_ID})
@@ -55,8 +85,8 @@ def _build_event(event_data: EventData, revision: int, dtstamp: datetime) -> Eve
     event.add("DESCRIPTION", event_data.description)
     event.add("UID", event_data.uid)
     event.add("SEQUENCE", revision)
-    event.add("STATUS", "CONFIRMED")
-    event.add("TRANSP", "OPAQUE")
+    event.add("STATUS", EVENT_STATUS)
+    event.add("TRANSP", EVENT_TRANSP)
     event.add("DTSTAMP", dtstamp)
 
     for alarm in _build_alarms():
@@ -65,8 +95,23 @@ def _build_event(event_data: EventData, revision: int, dtstamp: datetime) -> Eve
     return event
 
 
-def build_calendar(events: list[EventData], revision: int) -> Calendar:
-    """Construit le calendrier ICS complet."""
+def reproducible_dtstamp(source_digest: str) -> datetime:
+    """Dérive un DTSTAMP déterministe de l'empreinte SHA-256 (hex) du PDF source.
+
+    Le même PDF donne toujours le même DTSTAMP, donc un fichier ICS identique
+    octet pour octet ; un PDF modifié donne un autre DTSTAMP.
+    """
+    seconds = int(source_digest[:16], 16) % int(REPRODUCIBLE_SPAN.total_seconds())
+    return REPRODUCIBLE_EPOCH + timedelta(seconds=seconds)
+
+
+def _event_sort_key(event_data: EventData) -> tuple[datetime, datetime, str]:
+    """Ordre canonique des VEVENT : début, fin, puis UID pour départager."""
+    return event_data.dtstart, event_data.dtend, event_data.uid
+
+
+def _build_header() -> Calendar:
+    """Construit le VCALENDAR sans événements (propriétés + VTIMEZONE)."""
     cal = Calendar()
     cal.add("VERSION", "2.0")
     cal.add("PRODID", PRODID)
@@ -76,15 +121,152 @@ def build_calendar(events: list[EventData], revision: int) -> Calendar:
     cal.add("X-WR-TIMEZONE", TIMEZONE_ID)
 
     cal.add_component(_build_timezone())
+    return cal
+
+
+def build_calendar(
+    events: list[EventData], revision: int, dtstamp: datetime | None = None
+) -> Calendar:
+    """Construit le calendrier ICS complet, événements triés par date de début."""
+    cal = _build_header()
 
-    dtstamp = datetime.now(timezone.utc)
-    for event_data in events:
+    if dtstamp is None:
+        dtstamp = datetime.now(timezone.utc)
+    for event_data in sorted(events, key=_event_sort_key):
         cal.add_component(_build_event(event_data, revision, dtstamp))
 
     return cal
 
 
-def write_ics(calendar: Calendar, output_path: Path) -> None:
-    """Écrit le calendrier ICS dans un fichier."""
+def _render_chunk(events: list[EventData], revision: int, dtstamp: datetime) -> list[bytes]:
+    """Sérialise un lot de VEVENT (exécuté dans un processus du pool)."""
+    return [_build_event(e, revision, dtstamp).to_ical() for e in events]
+
+
+def _render_events(
+    events: list[EventData], revision: int, dtstamp: datetime, workers: int, chunk_size: int
+) -> list[bytes]:
+    """Rend chaque VEVENT, par lots sur un pool de processus pour les gros volumes."""
+    if workers <= 1 or len(events) < PARALLEL_THRESHOLD:
+        return _render_chunk(events, revision, dtstamp)
+    chunks = [events[i : i + chunk_size] for i in range(0, len(events), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rendered = pool.map(partial(_render_chunk, revision=revision, dtstamp=dtstamp), chunks)
+        return [fragment for chunk in rendered for fragment in chunk]
+
+
+def _template_digest() -> str:
+    """Empreinte du gabarit de rendu : toute modification invalide les fragments en cache.
+
+    Couvre la version du rendu, celle d'icalendar (qui peut changer la
+    sérialisation) et les constantes du gabarit.
+    """
+    raw = repr(
+        (
+            RENDER_VERSION,
+            icalendar.__version__,
+            TIMEZONE_ID,
+            ALARMS,
+            EVENT_STATUS,
+            EVENT_TRANSP,
+        )
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def fragment_key(event_data: EventData, revision: int) -> str:
+    """Clé de cache d'un VEVENT : contenu de l'événement, révision et gabarit."""
+    raw = f"{event_digest(event_data)}|{revision}|{_template_digest()}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _dtstamp_line(dtstamp: datetime) -> bytes:
+    """Ligne DTSTAMP telle qu'icalendar la rend, encadrée de ses fins de ligne."""
+    event = Event()
+    event.add("DTSTAMP", dtstamp)
+    return event.to_ical()[len(b"BEGIN:VEVENT") : -len(b"END:VEVENT\r\n")]
+
+
+def _render_cached(
+    events: list[EventData],
+    revision: int,
+    dtstamp: datetime,
+    workers: int,
+    chunk_size: int,
+    cache: FragmentCache,
+) -> list[bytes]:
+    """Reprend les VEVENT en cache et ne rend que les événements nouveaux ou modifiés."""
+    keys = [fragment_key(e, revision) for e in events]
+    fragments = cache.get_many(list(dict.fromkeys(keys)))
+
+    missing = {k: e for k, e in zip(keys, events) if k not in fragments}
+    rendered = _render_events(
+        list(missing.values()), revision, FRAGMENT_DTSTAMP, workers, chunk_size
+    )
+    new = dict(zip(missing, rendered))
+    cache.put_many(new)
+    fragments.update(new)
+
+    placeholder, actual = _dtstamp_line(FRAGMENT_DTSTAMP), _dtstamp_line(dtstamp)
+    return [fragments[k].replace(placeholder, actual) for k in keys]
+
+
+def serialize_calendar(
+    events: list[EventData],
+    revision: int,
+    dtstamp: datetime | None = None,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    cache: FragmentCache | None = None,
+) -> bytes:
+    """Sérialise le calendrier complet, en parallèle pour les gros volumes.
+
+    Les VEVENT sont rendus par lots indépendants sur un pool de processus puis
+    concaténés dans l'ordre canonique entre l'en-tête (VCALENDAR + VTIMEZONE)
+    et le pied. Avec ``cache``, les VEVENT déjà rendus lors d'une exécution
+    précédente sont repris du cache et seuls les autres sont rendus. Le
+    résultat est identique octet pour octet à
+    ``build_calendar(events, revision, dtstamp).to_ical()``.
+    """
+    if cache is None and (workers <= 1 or len(events) < PARALLEL_THRESHOLD):
+        return build_calendar(events, revision, dtstamp).to_ical()
+
+    ordered = sorted(events, key=_event_sort_key)
+    if dtstamp is None:
+        dtstamp = datetime.now(timezone.utc)
+
+    if cache is None:
+        bodies = _render_events(ordered, revision, dtstamp, workers, chunk_size)
+    else:
+        bodies = _render_cached(ordered, revision, dtstamp, workers, chunk_size, cache)
+
+    header = _build_header().to_ical()
+    return header[: -len(CALENDAR_FOOTER)] + b"".join(bodies) + CALENDAR_FOOTER
+
+
+def _is_unchanged(output_path: Path, data: bytes) -> bool:
+    """Compare le contenu à écrire au fichier existant (taille puis empreinte)."""
+    try:
+        if output_path.stat().st_size != len(data):
+            return False
+        existing = hashlib.sha256(output_path.read_bytes()).digest()
+    except FileNotFoundError:
+        return False
+    return existing == hashlib.sha256(data).digest()
+
+
+def write_ics(calendar: Calendar | bytes, output_path: Path) -> bool:
+    """Écrit le calendrier ICS (objet ou contenu déjà sérialisé) dans un fichier.
+
+    L'écriture est sautée si le fichier existant a déjà exactement ce contenu,
+    ce qui préserve sa date de modification pour les outils de synchronisation.
+
+    Returns:
+        True si le fichier a été écrit, False s'il était déjà à jour.
+    """
+    data = calendar if isinstance(calendar, bytes) else calendar.to_ical()
+    if _is_unchanged(output_path, data):
+        return False
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_bytes(calendar.to_ical())
+    output_path.write_bytes(data)
+    return True
@@ -0,0 +1,96 @@
+"""Cache persistant des fragments VEVENT déjà rendus.
+
+Chaque fragment est indexé par une clé dérivée du contenu de l'événement, de
+la révision et du gabarit de rendu (rappels, fuseau) : tant que ces éléments
+ne changent pas, le VEVENT est repris tel quel au lieu d'être reconstruit. Le
+cache est une base SQLite dont la taille est bornée ; les fragments les moins
+récemment utilisés sont évincés en premier.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_path() -> Path:
+    """Emplacement par défaut : $XDG_CACHE_HOME/planning_to_ics/fragments.sqlite3."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "planning_to_ics" / "fragments.sqlite3"
+
+
+class FragmentCache:
+    """Fragments ICS rendus, indexés par clé de contenu, avec éviction LRU."""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fragments ("
+            " key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL,"
+            " used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS fragments_used ON fragments (used)")
+        self._db.commit()
+
+    def __enter__(self) -> FragmentCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    @property
+    def size(self) -> int:
+        """Taille totale des fragments stockés, en octets."""
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM fragments").fetchone()[0]
+
+    def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        """Retourne les fragments connus parmi ``keys`` et les marque comme utilisés."""
+        found: dict[str, bytes] = {}
+        # Requêtes par lots : SQLite limite le nombre de paramètres par requête
+        for i in range(0, len(keys), 500):
+            batch = keys[i : i + 500]
+            marks = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT key, data FROM fragments WHERE key IN ({marks})", batch
+            )
+            found.update((key, bytes(data)) for key, data in rows)
+        if found:
+            now = time.time()
+            self._db.executemany(
+                "UPDATE fragments SET used = ? WHERE key = ?", [(now, k) for k in found]
+            )
+            self._db.commit()
+        return found
+
+    def put_many(self, fragments: dict[str, bytes]) -> None:
+        """Enregistre des fragments puis évince les plus anciens au-delà de la taille max."""
+        if not fragments:
+            return
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO fragments (key, data, size, used) VALUES (?, ?, ?, ?)",
+            [(key, data, len(data), now) for key, data in fragments.items()],
+        )
+        self._evict()
+        self._db.commit()
+
+    def _evict(self) -> None:
+        excess = self.size - self.max_bytes
+        if excess <= 0:
+            return
+        evicted = []
+        for key, size in self._db.execute("SELECT key, size FROM fragments ORDER BY used"):
+            evicted.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM fragments WHERE key = ?", evicted)
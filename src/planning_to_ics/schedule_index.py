@@ -0,0 +1,206 @@
+"""Index en mémoire des créneaux : requêtes par date/salle/classe et détection de conflits."""
+
+from __future__ import annotations
+
+import datetime
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from planning_to_ics.models import CourseSlot
+
+T = TypeVar("T")
+
+
+class IntervalIndex(Generic[T]):
+    """Intervalles semi-ouverts [début, fin) triés par début.
+
+    Le maximum cumulé des fins permet d'arrêter le parcours dès qu'aucun
+    intervalle commençant plus tôt ne peut encore chevaucher la requête.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[Any, Any, T]]) -> None:
+        ordered = sorted(intervals, key=lambda iv: (iv[0], iv[1]))
+        self._starts = [s for s, _, _ in ordered]
+        self._ends = [e for _, e, _ in ordered]
+        self._items = [item for _, _, item in ordered]
+        self._max_end: list[Any] = []
+        for end in self._ends:
+            self._max_end.append(end if not self._max_end else max(self._max_end[-1], end))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _scan(self, hi: int, after: Any) -> list[T]:
+        found = []
+        for i in range(hi - 1, -1, -1):
+            if self._max_end[i] <= after:
+                break
+            if self._ends[i] > after:
+                found.append(self._items[i])
+        found.reverse()
+        return found
+
+    def overlapping(self, start: Any, end: Any) -> list[T]:
+        """Éléments dont l'intervalle chevauche [start, end)."""
+        return self._scan(bisect_left(self._starts, end), start)
+
+    def covering(self, point: Any) -> list[T]:
+        """Éléments dont l'intervalle contient ``point``."""
+        return self._scan(bisect_right(self._starts, point), point)
+
+
+@dataclass(frozen=True)
+class ScheduledSlot:
+    """Créneau indexé, rattaché à l'enseignant (le PDF) dont il provient."""
+
+    slot: CourseSlot
+    teacher: str
+
+    @property
+    def start(self) -> datetime.datetime:
+        return datetime.datetime.combine(self.slot.date, self.slot.start_time)
+
+    @property
+    def end(self) -> datetime.datetime:
+        return datetime.datetime.combine(self.slot.date, self.slot.end_time)
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """Deux créneaux qui se chevauchent sur la même ressource."""
+
+    kind: str  # "salle", "classe" ou "enseignant"
+    key: str  # "S-301", "GI-L2", ...
+    first: ScheduledSlot
+    second: ScheduledSlot
+
+
+def _slot_key(slot: CourseSlot, teacher: str) -> tuple[object, ...]:
+    return (
+        teacher,
+        slot.date,
+        slot.start_time,
+        slot.end_time,
+        slot.course_name,
+        slot.course_type,
+        slot.class_group,
+        slot.room,
+    )
+
+
+def _sweep(
+    entries: Iterable[ScheduledSlot], kind: str, key: Callable[[ScheduledSlot], str]
+) -> list[Conflict]:
+    """Détecte les chevauchements par tri puis balayage, ressource par ressource.
+
+    Coût O(n log n + k) pour k conflits : chaque créneau n'est comparé qu'aux
+    créneaux encore en cours de la même ressource au moment où il commence.
+    """
+    ordered = sorted(
+        ((key(e), e.start, e.end, i, e) for i, e in enumerate(entries) if key(e)),
+        key=lambda t: t[:4],
+    )
+    conflicts: list[Conflict] = []
+    active: list[tuple[datetime.datetime, int, ScheduledSlot]] = []
+    current: str | None = None
+    for k, start, end, i, entry in ordered:
+        if k != current:
+            current, active = k, []
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, _, other in sorted(active, key=lambda a: a[1]):
+            if other.slot == entry.slot:
+                continue  # même cours assuré par plusieurs enseignants
+            conflicts.append(Conflict(kind=kind, key=k, first=other, second=entry))
+        heapq.heappush(active, (end, i, entry))
+    return conflicts
+
+
+class ScheduleIndex:
+    """Index des créneaux par date, salle, classe et enseignant.
+
+    Les créneaux identiques présents dans plusieurs PDF d'un même enseignant
+    (périodes qui se recouvrent) ne sont indexés qu'une fois. Un même cours
+    assuré par deux enseignants est indexé pour chacun, sans être signalé
+    comme conflit de salle ou de classe.
+    """
+
+    def __init__(self, slots: Iterable[CourseSlot] = (), teacher: str = "") -> None:
+        self._entries: list[ScheduledSlot] = []
+        self._seen: set[tuple[object, ...]] = set()
+        self._by_date: dict[datetime.date, list[ScheduledSlot]] = defaultdict(list)
+        self._by_room: dict[str, list[ScheduledSlot]] = defaultdict(list)
+        self._by_group: dict[str, list[ScheduledSlot]] = defaultdict(list)
+        self._room_intervals: dict[str, IntervalIndex[ScheduledSlot]] = {}
+        self.add(slots, teacher)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, slots: Iterable[CourseSlot], teacher: str = "") -> None:
+        """Ajoute les créneaux d'un PDF (``teacher`` identifie leur source)."""
+        for slot in slots:
+            key = _slot_key(slot, teacher)
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            entry = ScheduledSlot(slot=slot, teacher=teacher)
+            self._entries.append(entry)
+            self._by_date[slot.date].append(entry)
+            self._by_room[slot.room].append(entry)
+            self._by_group[slot.class_group].append(entry)
+            self._room_intervals.pop(slot.room, None)
+
+    def _room_index(self, room: str) -> IntervalIndex[ScheduledSlot]:
+        index = self._room_intervals.get(room)
+        if index is None:
+            index = IntervalIndex((e.start, e.end, e) for e in self._by_room.get(room, []))
+            self._room_intervals[room] = index
+        return index
+
+    def in_room(
+        self, room: str, start: datetime.datetime, end: datetime.datetime
+    ) -> list[ScheduledSlot]:
+        """Créneaux occupant ``room`` entre ``start`` et ``end``."""
+        return self._room_index(room).overlapping(start, end)
+
+    def query(
+        self,
+        date: datetime.date | None = None,
+        room: str | None = None,
+        group: str | None = None,
+        teacher: str | None = None,
+    ) -> list[ScheduledSlot]:
+        """Créneaux correspondant à tous les critères donnés, triés chronologiquement."""
+        if date is not None and room is not None:
+            day = datetime.datetime.combine(date, datetime.time())
+            candidates = self.in_room(room, day, day + datetime.timedelta(days=1))
+        elif date is not None:
+            candidates = self._by_date.get(date, [])
+        elif room is not None:
+            candidates = self._by_room.get(room, [])
+        elif group is not None:
+            candidates = self._by_group.get(group, [])
+        else:
+            candidates = self._entries
+
+        found = [
+            e
+            for e in candidates
+            if (room is None or e.slot.room == room)
+            and (group is None or e.slot.class_group == group)
+            and (teacher is None or e.teacher == teacher)
+        ]
+        return sorted(found, key=lambda e: (e.start, e.end))
+
+    def conflicts(self) -> list[Conflict]:
+        """Salles doublement réservées, classes et enseignants à deux endroits à la fois."""
+        return (
+            _sweep(self._entries, "salle", lambda e: e.slot.room)
+            + _sweep(self._entries, "classe", lambda e: e.slot.class_group)
+            + _sweep(self._entries, "enseignant", lambda e: e.teacher)
+        )
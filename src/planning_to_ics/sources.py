@@ -0,0 +1,219 @@
+"""Lecture des PDF depuis un fichier, une archive ZIP ou un export mail (.eml, .mbox).
+
+Les PDF sont lus en mémoire (aucune extraction sur disque), dédoublonnés par
+empreinte de contenu, classés du plus ancien au plus récent (date du message ou
+de l'archive, sinon date inscrite dans le PDF), puis analysés en parallèle.
+"""
+
+from __future__ import annotations
+
+import datetime
+import email
+import email.policy
+import email.utils
+import hashlib
+import io
+import mailbox
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from email.message import Message
+from functools import cached_property, partial
+from pathlib import Path, PurePosixPath
+
+from planning_to_ics.backends import DEFAULT_BACKEND, pdf_modified_at
+from planning_to_ics.converter import compute_uid
+from planning_to_ics.extractor import extract_courses
+from planning_to_ics.models import CourseSlot, SchedulePeriod
+
+PDF_CONTENT_TYPE = "application/pdf"
+
+# Clé de tri des PDF sans aucune date connue : classés avant les autres
+UNKNOWN_DATE = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+
+@dataclass(frozen=True)
+class PdfInput:
+    """Un PDF lu en mémoire, avec son origine pour l'affichage."""
+
+    name: str  # "export.mbox:planning_semaine_8.pdf"
+    data: bytes
+    sent_at: datetime.datetime | None = None  # date du message ou du membre de l'archive
+
+    @cached_property
+    def digest(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    @cached_property
+    def modified_at(self) -> datetime.datetime | None:
+        """Date de modification inscrite dans les métadonnées du PDF, si présente."""
+        return pdf_modified_at(self.data)
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.name.rsplit(":", 1)[-1]).stem
+
+
+def _is_pdf_name(name: str | None) -> bool:
+    return name is not None and name.lower().endswith(".pdf")
+
+
+def _iter_zip(path: Path) -> Iterator[PdfInput]:
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and _is_pdf_name(info.filename):
+                # Heure locale sans fuseau dans l'archive
+                stamp = datetime.datetime(*info.date_time).astimezone(datetime.timezone.utc)
+                yield PdfInput(
+                    name=f"{path.name}:{info.filename}", data=archive.read(info), sent_at=stamp
+                )
+
+
+def _message_date(message: Message) -> datetime.datetime | None:
+    header = message.get("Date")
+    if header is None:
+        return None
+    try:
+        stamp = email.utils.parsedate_to_datetime(str(header))
+    except (TypeError, ValueError):
+        return None
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=datetime.timezone.utc)
+    return stamp.astimezone(datetime.timezone.utc)
+
+
+def _iter_attachments(message: Message, origin: str) -> Iterator[PdfInput]:
+    sent_at = _message_date(message)
+    for part in message.walk():
+        if part.is_multipart():
+            continue
+        filename = part.get_filename()
+        if part.get_content_type() != PDF_CONTENT_TYPE and not _is_pdf_name(filename):
+            continue
+        data = part.get_payload(decode=True)
+        if isinstance(data, bytes) and data:
+            name = f"{origin}:{filename or 'piece_jointe.pdf'}"
+            yield PdfInput(name=name, data=data, sent_at=sent_at)
+
+
+def _iter_eml(path: Path) -> Iterator[PdfInput]:
+    message = email.message_from_bytes(path.read_bytes(), policy=email.policy.default)
+    yield from _iter_attachments(message, path.name)
+
+
+def _iter_mbox(path: Path) -> Iterator[PdfInput]:
+    box = mailbox.mbox(path, create=False)
+    try:
+        for message in box:
+            yield from _iter_attachments(message, path.name)
+    finally:
+        box.close()
+
+
+def iter_pdf_inputs(path: Path) -> Iterator[PdfInput]:
+    """Énumère les PDF contenus dans ``path`` (PDF, .zip, .eml ou .mbox)."""
+    suffix = path.suffix.lower()
+    if suffix == ".zip":
+        yield from _iter_zip(path)
+    elif suffix == ".eml":
+        yield from _iter_eml(path)
+    elif suffix == ".mbox":
+        yield from _iter_mbox(path)
+    else:
+        yield PdfInput(name=path.name, data=path.read_bytes())
+
+
+def _chronological_key(pdf: PdfInput) -> datetime.datetime:
+    return pdf.sent_at or pdf.modified_at or UNKNOWN_DATE
+
+
+def read_pdf_inputs(path: Path) -> list[PdfInput]:
+    """Lit les PDF de ``path``, sans les doublons de contenu (pièce jointe renvoyée).
+
+    Les PDF sont classés du plus ancien au plus récent ; à date égale, l'ordre
+    de l'archive ou de la boîte mail est conservé.
+    """
+    seen: set[str] = set()
+    inputs = []
+    for pdf in iter_pdf_inputs(path):
+        if pdf.digest not in seen:
+            seen.add(pdf.digest)
+            inputs.append(pdf)
+    if len(inputs) > 1:
+        inputs.sort(key=_chronological_key)
+    return inputs
+
+
+def _extract_data(
+    data: bytes,
+    backend: str,
+    date_from: datetime.date | None,
+    date_to: datetime.date | None,
+) -> tuple[list[CourseSlot], SchedulePeriod | None]:
+    """Extrait un PDF en mémoire (exécuté dans un processus du pool)."""
+    return extract_courses(
+        io.BytesIO(data), backend=backend, date_from=date_from, date_to=date_to
+    )
+
+
+def extract_inputs(
+    inputs: list[PdfInput],
+    backend: str = DEFAULT_BACKEND,
+    date_from: datetime.date | None = None,
+    date_to: datetime.date | None = None,
+    workers: int = 1,
+) -> list[tuple[list[CourseSlot], SchedulePeriod | None]]:
+    """Extrait chaque PDF, en parallèle sur un pool de processus si ``workers`` > 1."""
+    extract = partial(_extract_data, backend=backend, date_from=date_from, date_to=date_to)
+    datas = [pdf.data for pdf in inputs]
+    if workers <= 1 or len(inputs) <= 1:
+        return [extract(data) for data in datas]
+    with ProcessPoolExecutor(max_workers=min(workers, len(inputs))) as pool:
+        return list(pool.map(extract, datas))
+
+
+def merge_extractions(
+    results: list[tuple[list[CourseSlot], SchedulePeriod | None]],
+    sources: list[str] | None = None,
+) -> tuple[list[CourseSlot], SchedulePeriod | None]:
+    """Fusionne plusieurs extractions en une seule liste triée, période englobante.
+
+    ``results`` va du PDF le plus ancien au plus récent ; ``sources`` donne
+    l'identité de chaque PDF (``PdfInput.stem``, le nom de l'enseignant pour
+    EasyLMD), la même pour tous s'il est omis. Un PDF fait autorité sur sa
+    période pour sa source seulement : il remplace les créneaux des PDF plus
+    anciens de la même source tombant dans cette période, ce qui reporte les
+    changements d'horaire ou de salle et les annulations, sans toucher aux
+    cours des autres enseignants. Un créneau présent chez plusieurs
+    enseignants (co-enseignement) n'est gardé qu'une fois.
+    """
+    if len(results) == 1:
+        return results[0]
+    if sources is None:
+        sources = [""] * len(results)
+
+    merged: list[tuple[str, CourseSlot]] = []
+    periods: list[SchedulePeriod] = []
+    for (courses, period), source in zip(results, sources, strict=True):
+        if period is None and courses:
+            dates = [c.date for c in courses]
+            period = SchedulePeriod(start=min(dates), end=max(dates))
+        if period is not None:
+            merged = [
+                (s, c)
+                for s, c in merged
+                if s != source or not period.start <= c.date <= period.end
+            ]
+            periods.append(period)
+        merged.extend((source, c) for c in courses)
+
+    unique: dict[tuple[str, str], CourseSlot] = {}
+    for _, course in merged:
+        unique.setdefault((compute_uid(course), course.class_group), course)
+    courses = sorted(unique.values(), key=lambda c: (c.date, c.start_time, c.end_time))
+    if not periods:
+        return courses, None
+    return courses, SchedulePeriod(
+        start=min(p.start for p in periods), end=max(p.end for p in periods)
+    )
@@ -0,0 +1,193 @@
+"""Tests de la publication CalDAV contre un serveur local (aucun accès réseau externe)."""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from planning_to_ics.caldav import push_events
+from planning_to_ics.converter import EventData, convert_slot
+from planning_to_ics.models import CourseSlot, SchedulePeriod
+
+
+class _CalDavStandIn(ThreadingHTTPServer):
+    """Collection CalDAV minimale : PUT/DELETE de ressources en mémoire."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.resources: dict[str, bytes] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/calendars/prof/cours/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _CalDavStandIn
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _reply(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_PUT(self) -> None:  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.requests.append(("PUT", self.path))
+            created = self.path not in self.server.resources
+            self.server.resources[self.path] = body
+        self._reply(201 if created else 204)
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        with self.server.lock:
+            self.server.requests.append(("DELETE", self.path))
+            found = self.server.resources.pop(self.path, None) is not None
+        self._reply(204 if found else 404)
+
+
+@pytest.fixture
+def server() -> Iterator[_CalDavStandIn]:
+    srv = _CalDavStandIn()
+    thread = threading.Thread(target=srv.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def events(expected_courses: list[CourseSlot]) -> list[EventData]:
+    return [convert_slot(c) for c in expected_courses]
+
+
+class TestPushEvents:
+    def test_first_push_uploads_everything(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        result = push_events(events, server.url, tmp_path / "state.json", concurrency=2)
+        assert sorted(result.uploaded) == sorted(e.uid for e in events)
+        assert result.failed == []
+        assert len(server.resources) == 6
+        path = next(iter(server.resources))
+        assert path.startswith("/calendars/prof/cours/")
+        assert path.endswith("%40esgcvak.com.ics")
+        assert b"BEGIN:VTIMEZONE" in server.resources[path]
+
+    def test_connections_reused(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        push_events(events, server.url, tmp_path / "state.json", concurrency=2)
+        assert server.connections <= 2
+
+    def test_second_push_sends_nothing(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        state = tmp_path / "state.json"
+        push_events(events, server.url, state)
+        server.requests.clear()
+
+        result = push_events(events, server.url, state)
+        assert server.requests == []
+        assert result.unchanged == 6
+
+    def test_only_changes_pushed(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        state = tmp_path / "state.json"
+        push_events(events, server.url, state)
+        server.requests.clear()
+
+        moved = dataclasses.replace(events[0], location="S-101, ESGC-VAK")
+        period = SchedulePeriod(start=datetime.date(2026, 2, 9), end=datetime.date(2026, 2, 28))
+        result = push_events([moved] + events[1:5], server.url, state, period=period)
+
+        assert result.uploaded == [moved.uid]
+        assert result.deleted == [events[5].uid]
+        assert sorted(method for method, _ in server.requests) == ["DELETE", "PUT"]
+        assert len(server.resources) == 5
+
+    def test_new_revision_reuploads(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        state = tmp_path / "state.json"
+        push_events(events, server.url, state, revision=0)
+        result = push_events(events, server.url, state, revision=1)
+        assert len(result.uploaded) == 6
+
+    def test_deletions_limited_to_period(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        """Publier une seule journée ne supprime pas les autres jours."""
+        state = tmp_path / "state.json"
+        push_events(events, server.url, state)
+
+        monday = events[0].dtstart.date()
+        result = push_events(
+            [], server.url, state, period=SchedulePeriod(start=monday, end=monday)
+        )
+        assert result.deleted == [events[0].uid]
+        assert len(server.resources) == 5
+
+    def test_deletions_limited_to_source(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        """Dans une collection partagée, publier le PDF de B ne supprime pas les cours de A."""
+        state = tmp_path / "state.json"
+        period = SchedulePeriod(start=datetime.date(2026, 2, 9), end=datetime.date(2026, 2, 14))
+        push_events(events[:3], server.url, state, period=period, source="prof_a")
+        result = push_events(events[3:], server.url, state, period=period, source="prof_b")
+        assert result.deleted == []
+        assert len(server.resources) == 6
+
+        result = push_events(events[:2], server.url, state, period=period, source="prof_a")
+        assert result.deleted == [events[2].uid]
+        assert len(server.resources) == 5
+
+    def test_shared_event_kept_while_another_source_publishes_it(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        """A puis B publient le même cours ; A le retire, B le publie encore."""
+        state = tmp_path / "state.json"
+        period = SchedulePeriod(start=datetime.date(2026, 2, 9), end=datetime.date(2026, 2, 14))
+        push_events(events[:2], server.url, state, period=period, source="prof_a")
+        server.requests.clear()
+        result = push_events(events[1:3], server.url, state, period=period, source="prof_b")
+        assert result.uploaded == [events[2].uid]
+        assert result.unchanged == 1
+
+        result = push_events(events[:1], server.url, state, period=period, source="prof_a")
+        assert result.deleted == []
+        assert len(server.resources) == 3
+
+        result = push_events(events[2:3], server.url, state, period=period, source="prof_b")
+        assert result.deleted == [events[1].uid]
+        assert len(server.resources) == 2
+
+    def test_corrupt_state(
+        self, server: _CalDavStandIn, events: list[EventData], tmp_path: Path
+    ) -> None:
+        state = tmp_path / "state.json"
+        state.write_text('{"http://')
+        with pytest.raises(ValueError, match="Fichier d'état illisible"):
+            push_events(events, server.url, state)
+        assert server.requests == []
@@ -0,0 +1,191 @@
+"""Tests du catalogue des calendriers générés."""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import os
+import re
+from pathlib import Path
+
+import pytest
+from icalendar import Calendar
+
+from planning_to_ics.catalog import Catalog, ics_filename
+from planning_to_ics.converter import EventData, convert_slot
+from planning_to_ics.ics_writer import serialize_calendar, write_ics
+from planning_to_ics.models import CourseSlot, SchedulePeriod
+
+UTC = datetime.timezone.utc
+D = datetime.date
+
+
+@pytest.fixture
+def events(expected_courses: list[CourseSlot]) -> list[EventData]:
+    return [convert_slot(c) for c in expected_courses]
+
+
+def _generate(
+    catalog: Catalog,
+    events: list[EventData],
+    period: SchedulePeriod,
+    generated_at: datetime.datetime,
+) -> Path:
+    path = catalog.output_dir / ics_filename(period)
+    write_ics(serialize_calendar(events, 0), path)
+    catalog.record(path, period, "digest", events, generated_at=generated_at)
+    return path
+
+
+class TestCatalog:
+    def test_save_and_reload(self, events: list[EventData], tmp_path: Path) -> None:
+        catalog = Catalog(tmp_path)
+        period = SchedulePeriod(D(2026, 2, 9), D(2026, 2, 14))
+        _generate(catalog, events, period, datetime.datetime(2026, 2, 1, tzinfo=UTC))
+        catalog.save()
+
+        entry = Catalog(tmp_path).entries["esgcvak_2026-02-09_2026-02-14.ics"]
+        assert (entry.start, entry.end) == (period.start, period.end)
+        assert entry.event_count == 6
+        assert sorted(entry.uids) == sorted(e.uid for e in events)
+        assert entry.generated_at == datetime.datetime(2026, 2, 1, tzinfo=UTC)
+
+    def test_covering(self, events: list[EventData], tmp_path: Path) -> None:
+        catalog = Catalog(tmp_path)
+        wide = SchedulePeriod(D(2026, 2, 9), D(2026, 2, 28))
+        narrow = SchedulePeriod(D(2026, 2, 15), D(2026, 2, 22))
+        _generate(catalog, events, wide, datetime.datetime(2026, 2, 1, tzinfo=UTC))
+        _generate(catalog, [], narrow, datetime.datetime(2026, 2, 2, tzinfo=UTC))
+
+        assert [e.filename for e in catalog.covering(D(2026, 2, 22))] == [
+            "esgcvak_2026-02-15_2026-02-22.ics",
+            "esgcvak_2026-02-09_2026-02-28.ics",
+        ]
+        assert len(catalog.covering(D(2026, 2, 28))) == 1
+        assert catalog.covering(D(2026, 3, 1)) == []
+
+    def test_superseded(self, events: list[EventData], tmp_path: Path) -> None:
+        """Remplacé dès que des générations plus récentes couvrent toute sa période."""
+        catalog = Catalog(tmp_path)
+        old = SchedulePeriod(D(2026, 2, 9), D(2026, 2, 22))
+        first = SchedulePeriod(D(2026, 2, 9), D(2026, 2, 15))
+        second = SchedulePeriod(D(2026, 2, 16), D(2026, 2, 28))
+        _generate(catalog, events, old, datetime.datetime(2026, 2, 1, tzinfo=UTC))
+        _generate(catalog, events, first, datetime.datetime(2026, 2, 2, tzinfo=UTC))
+        assert catalog.superseded() == []
+
+        _generate(catalog, [], second, datetime.datetime(2026, 2, 3, tzinfo=UTC))
+        assert [e.filename for e in catalog.superseded()] == [
+            "esgcvak_2026-02-09_2026-02-22.ics"
+        ]
+
+    def test_compact_newest_wins(self, events: list[EventData], tmp_path: Path) -> None:
+        catalog = Catalog(tmp_path)
+        wide = SchedulePeriod(D(2026, 2, 9), D(2026, 2, 28))
+        narrow = SchedulePeriod(D(2026, 2, 10), D(2026, 2, 10))
+        moved = dataclasses.replace(events[1], location="S-101, ESGC-VAK")
+        _generate(catalog, events, wide, datetime.datetime(2026, 2, 1, tzinfo=UTC))
+        # Le 10/02 ne compte plus qu'un cours, déplacé
+        _generate(catalog, [moved], narrow, datetime.datetime(2026, 2, 2, tzinfo=UTC))
+
+        (group,) = catalog.overlapping_groups()
+        merged = catalog.compact(group)
+
+        assert merged.filename == "esgcvak_2026-02-09_2026-02-28.ics"
+        assert merged.generated_at == datetime.datetime(2026, 2, 2, tzinfo=UTC)
+        assert list(catalog.entries) == [merged.filename]
+        assert sorted(p.name for p in tmp_path.glob("*.ics")) == [merged.filename]
+        cal = Calendar.from_ical((tmp_path / merged.filename).read_bytes())
+        vevents = cal.walk("VEVENT")
+        assert len(vevents) == merged.event_count == 5
+        by_uid = {str(v["UID"]): v for v in vevents}
+        assert str(by_uid[moved.uid]["LOCATION"]) == "S-101, ESGC-VAK"
+        assert events[2].uid not in by_uid
+
+    def test_compact_missing_file(self, events: list[EventData], tmp_path: Path) -> None:
+        catalog = Catalog(tmp_path)
+        wide = SchedulePeriod(D(2026, 2, 9), D(2026, 2, 28))
+        narrow = SchedulePeriod(D(2026, 2, 10), D(2026, 2, 10))
+        _generate(catalog, events, wide, datetime.datetime(2026, 2, 1, tzinfo=UTC))
+        _generate(catalog, [], narrow, datetime.datetime(2026, 2, 2, tzinfo=UTC)).unlink()
+
+        (group,) = catalog.overlapping_groups()
+        with pytest.raises(FileNotFoundError, match="esgcvak_2026-02-10_2026-02-10.ics"):
+            catalog.compact(group)
+        assert len(catalog.entries) == 2
+        assert (tmp_path / "esgcvak_2026-02-09_2026-02-28.ics").exists()
+
+    def test_rebuild_drops_missing_files(self, events: list[EventData], tmp_path: Path) -> None:
+        """Un fichier supprimé disparaît du catalogue ; renommé, il y change de nom."""
+        catalog = Catalog(tmp_path)
+        first = SchedulePeriod(D(2026, 2, 9), D(2026, 2, 14))
+        second = SchedulePeriod(D(2026, 2, 16), D(2026, 2, 21))
+        stamp = datetime.datetime(2026, 2, 1, tzinfo=UTC)
+        _generate(catalog, events, first, stamp).unlink()
+        _generate(catalog, [], second, stamp).rename(tmp_path / "esgcvak_2026-02-16_2026-02-22.ics")
+        catalog.save()
+
+        catalog = Catalog(tmp_path)
+        assert [e.filename for e in catalog.missing()] == [
+            "esgcvak_2026-02-09_2026-02-14.ics",
+            "esgcvak_2026-02-16_2026-02-21.ics",
+        ]
+        (entry,) = catalog.rebuild()
+        assert entry.filename == "esgcvak_2026-02-16_2026-02-22.ics"
+        assert list(catalog.entries) == [entry.filename]
+        assert catalog.covering(D(2026, 2, 10)) == []
+        assert catalog.missing() == []
+
+    def test_rebuild_from_directory(self, events: list[EventData], tmp_path: Path) -> None:
+        path = tmp_path / "esgcvak_2026-02-09_2026-02-14.ics"
+        dtstamp = datetime.datetime(2026, 2, 10, 7, 0, tzinfo=UTC)
+        write_ics(serialize_calendar(events, 0, dtstamp=dtstamp), path)
+        (tmp_path / "autre.ics").write_bytes(b"")
+
+        catalog = Catalog(tmp_path)
+        (entry,) = catalog.rebuild()
+        assert entry.filename == path.name
+        assert entry.event_count == 6
+        assert entry.generated_at == dtstamp
+        assert catalog.rebuild() == []
+
+    def test_rebuild_without_dtstamp_uses_mtime(
+        self, events: list[EventData], tmp_path: Path
+    ) -> None:
+        path = tmp_path / "esgcvak_2026-02-09_2026-02-14.ics"
+        data = serialize_calendar(events, 0)
+        write_ics(re.sub(rb"DTSTAMP:[^\r\n]*\r\n", b"", data), path)
+        os.utime(path, (1_770_000_000, 1_770_000_000))
+
+        (entry,) = Catalog(tmp_path).rebuild()
+        assert entry.generated_at == datetime.datetime.fromtimestamp(1_770_000_000, UTC)
+
+    def test_rebuild_ignores_misleading_mtimes(
+        self, events: list[EventData], tmp_path: Path
+    ) -> None:
+        """Après une copie, le calendrier le plus ancien a le mtime le plus récent."""
+        wide = tmp_path / "esgcvak_2026-02-09_2026-02-28.ics"
+        narrow = tmp_path / "esgcvak_2026-02-15_2026-02-22.ics"
+        next_week = [
+            dataclasses.replace(
+                e,
+                uid=f"s2-{e.uid}",
+                dtstart=e.dtstart + datetime.timedelta(days=7),
+                dtend=e.dtend + datetime.timedelta(days=7),
+            )
+            for e in events
+        ]
+        stamp = datetime.datetime(2026, 2, 10, tzinfo=UTC)
+        write_ics(serialize_calendar(events, 0, dtstamp=stamp), wide)
+        stamp = datetime.datetime(2026, 2, 16, tzinfo=UTC)
+        write_ics(serialize_calendar(next_week, 0, dtstamp=stamp), narrow)
+        os.utime(narrow, (1_770_000_000, 1_770_000_000))
+        os.utime(wide, (1_780_000_000, 1_780_000_000))
+
+        catalog = Catalog(tmp_path)
+        catalog.rebuild()
+        assert catalog.superseded() == []
+        (group,) = catalog.overlapping_groups()
+        merged = catalog.compact(group)
+        assert merged.event_count == 12
+        assert b"DTSTAMP:20260216T000000Z" in (tmp_path / merged.filename).read_bytes()
@@ -0,0 +1,179 @@
+"""Tests des sous-commandes de la ligne de commande."""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import shutil
+from pathlib import Path
+
+import pytest
+
+from planning_to_ics import cli
+from planning_to_ics.catalog import Catalog, ics_filename
+from planning_to_ics.cli import main
+from planning_to_ics.ics_writer import serialize_calendar, write_ics
+from planning_to_ics.models import CourseSlot, SchedulePeriod
+
+
+class TestQuery:
+    def test_group_and_date(self, sample_pdf: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        main(["query", str(sample_pdf), "--group", "GI-L2", "--date", "10/02/2026"])
+        out = capsys.readouterr().out
+        assert "1 créneaux trouvés" in out
+        assert "Mar 10/02  08:00-12:00  [GI-L2]" in out
+        assert "(sample_schedule)" in out
+
+    def test_window_filters(self, sample_pdf: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        main(["query", str(sample_pdf), "--from", "2026-02-12"])
+        assert "2 créneaux trouvés" in capsys.readouterr().out
+
+    def test_invalid_date(self, sample_pdf: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        with pytest.raises(SystemExit) as exc:
+            main(["query", str(sample_pdf), "--date", "31/02/2026"])
+        assert exc.value.code == 2
+        assert "date invalide : 31/02/2026" in capsys.readouterr().err
+
+    def test_missing_file(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        with pytest.raises(SystemExit) as exc:
+            main(["query", str(tmp_path / "absent.pdf")])
+        assert exc.value.code == 1
+        assert "Fichier introuvable" in capsys.readouterr().err
+
+
+class TestConflicts:
+    def test_no_conflict(self, sample_pdf: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        main(["conflicts", str(sample_pdf)])
+        assert "Aucun conflit sur 6 créneaux" in capsys.readouterr().out
+
+    def test_conflicts_exit_code(
+        self,
+        sample_pdf: Path,
+        tmp_path: Path,
+        expected_courses: list[CourseSlot],
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Le PDF de prof_b place un autre cours en S-301 le mardi matin."""
+        other = tmp_path / "prof_b.pdf"
+        shutil.copy(sample_pdf, other)
+        intruder = dataclasses.replace(
+            expected_courses[1], course_name="Réseaux", class_group="GI-L3"
+        )
+        monkeypatch.setattr(
+            cli,
+            "extract_inputs",
+            lambda inputs, **_: [(expected_courses, None), ([intruder], None)],
+        )
+        with pytest.raises(SystemExit) as exc:
+            main(["conflicts", str(sample_pdf), str(other)])
+        assert exc.value.code == 1
+        out = capsys.readouterr().out
+        assert "1 conflits sur 7 créneaux" in out
+        assert "Salle S-301 :" in out
+        assert "[GI-L3] Réseaux" in out
+        assert "(prof_b)" in out
+
+
+class TestPush:
+    @pytest.mark.parametrize("option", ["--concurrency", "--workers"])
+    def test_non_positive_rejected(
+        self, sample_pdf: Path, option: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        with pytest.raises(SystemExit) as exc:
+            main(["push", str(sample_pdf), "--url", "http://127.0.0.1:9/", option, "0"])
+        assert exc.value.code == 2
+        assert "entier positif attendu : 0" in capsys.readouterr().err
+
+    def test_corrupt_state(
+        self, sample_pdf: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        state = tmp_path / "state.json"
+        state.write_text("{")
+        with pytest.raises(SystemExit) as exc:
+            main(["push", str(sample_pdf), "--url", "http://127.0.0.1:9/", "--state", str(state)])
+        assert exc.value.code == 1
+        assert "❌ Fichier d'état illisible" in capsys.readouterr().err
+
+
+class TestCatalog:
+    def _catalog(self, tmp_path: Path) -> Catalog:
+        catalog = Catalog(tmp_path)
+        stamp = datetime.datetime(2026, 2, 1, tzinfo=datetime.timezone.utc)
+        for period in (
+            SchedulePeriod(datetime.date(2026, 2, 9), datetime.date(2026, 2, 28)),
+            SchedulePeriod(datetime.date(2026, 2, 10), datetime.date(2026, 2, 10)),
+        ):
+            path = tmp_path / ics_filename(period)
+            write_ics(serialize_calendar([], 0), path)
+            catalog.record(path, period, "digest", [], generated_at=stamp)
+        catalog.save()
+        return catalog
+
+    def test_missing_file_flagged(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        self._catalog(tmp_path)
+        (tmp_path / "esgcvak_2026-02-10_2026-02-10.ics").unlink()
+
+        main(["catalog", "--output-dir", str(tmp_path), "covers", "10/02/2026"])
+        out = capsys.readouterr().out
+        assert "esgcvak_2026-02-10_2026-02-10.ics" in out
+        assert out.count("fichier introuvable") == 1
+        assert "catalog rebuild" in out
+
+    def test_compact_missing_file(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        self._catalog(tmp_path)
+        (tmp_path / "esgcvak_2026-02-10_2026-02-10.ics").unlink()
+
+        with pytest.raises(SystemExit) as exc:
+            main(["catalog", "--output-dir", str(tmp_path), "compact"])
+        assert exc.value.code == 1
+        assert "❌ Calendriers catalogués introuvables" in capsys.readouterr().err
+
+        main(["catalog", "--output-dir", str(tmp_path), "rebuild"])
+        assert "1 calendriers introuvables retirés" in capsys.readouterr().out
+        assert list(Catalog(tmp_path).entries) == ["esgcvak_2026-02-09_2026-02-28.ics"]
+
+
+class TestDispatch:
+    def test_default_is_convert(
+        self, sample_pdf: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        main([str(sample_pdf), "--output-dir", str(tmp_path), "--dry-run"])
+        out = capsys.readouterr().out
+        assert "6 cours trouvés" in out
+        assert "Mode dry-run" in out
+        assert list(tmp_path.iterdir()) == []
+
+    def test_subcommand_help(self, capsys: pytest.CaptureFixture[str]) -> None:
+        with pytest.raises(SystemExit) as exc:
+            main(["conflicts", "--help"])
+        assert exc.value.code == 0
+        assert "planning.py conflicts" in capsys.readouterr().out
+
+
+class TestConvert:
+    def test_invalid_source_date_epoch(
+        self,
+        sample_pdf: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "abc")
+        with pytest.raises(SystemExit) as exc:
+            main([str(sample_pdf), "--output-dir", str(tmp_path), "--reproducible"])
+        assert exc.value.code == 1
+        assert "❌ SOURCE_DATE_EPOCH invalide : abc" in capsys.readouterr().err
+        assert list(tmp_path.iterdir()) == []
+
+    def test_reproducible_dtstamp_from_pdf_metadata(
+        self, sample_pdf: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        main([str(sample_pdf), "--output-dir", str(tmp_path), "--reproducible"])
+        (ics,) = tmp_path.glob("*.ics")
+        assert b"DTSTAMP:20260209T201051Z" in ics.read_bytes()
@@ -7,6 +7,7 @@ import datetime
 from planning_to_ics.converter import (
     compute_uid,
     convert_slot,
+    event_digest,
     format_description,
     format_location,
     format_summary,
@@ -83,3 +84,14 @@ class TestConvertSlot:
         assert event.location
         assert event.description
         assert event.uid
+
+
+class TestEventDigest:
+    def test_deterministic(self) -> None:
+        assert event_digest(convert_slot(_make_slot())) == event_digest(convert_slot(_make_slot()))
+
+    def test_changes_with_content(self) -> None:
+        base = convert_slot(_make_slot())
+        moved = convert_slot(_make_slot(room="S-304"))
+        assert base.uid == moved.uid
+        assert event_digest(base) != event_digest(moved)
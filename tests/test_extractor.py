@@ -3,10 +3,18 @@
 from __future__ import annotations
 
 import datetime
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+import pytest
+
+from planning_to_ics import backends
+from planning_to_ics.backends import BACKENDS, get_backend, parse_pdf_date, pdf_modified_at
 from planning_to_ics.extractor import extract_courses
-from planning_to_ics.models import CourseSlot
+from planning_to_ics.models import CourseSlot, SchedulePeriod
+
+FakeBackend = tuple[list[list[str]], list[int], list[int]]
 
 
 class TestExtractCourses:
@@ -45,3 +53,126 @@ class TestExtractCourses:
         courses, _ = extract_courses(sample_pdf)
         for c in courses:
             assert c.course_type == "CM/TD"
+
+
+class TestBackends:
+    @pytest.mark.parametrize("backend", sorted(BACKENDS))
+    def test_all_courses_match(
+        self, sample_pdf: Path, expected_courses: list[CourseSlot], backend: str
+    ) -> None:
+        courses, period = extract_courses(sample_pdf, backend=backend)
+        assert courses == expected_courses
+        assert period is not None
+        assert period.start == datetime.date(2026, 2, 9)
+
+    def test_pdfium_tables_match_pdfplumber(self, sample_pdf: Path) -> None:
+        """Les cellules fusionnées valent None dans les deux moteurs."""
+        with get_backend("pdfplumber")(sample_pdf) as pages:
+            reference = pages[0].extract_tables()
+        with get_backend("pdfium")(sample_pdf) as pages:
+            assert pages[0].extract_tables() == reference
+
+    def test_unknown_backend(self) -> None:
+        with pytest.raises(ValueError, match="Moteur PDF inconnu"):
+            get_backend("inconnu")
+
+
+class TestPdfDate:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("D:20260209211051+01'00'", datetime.datetime(2026, 2, 9, 20, 10, 51)),
+            ("D:20260209211051Z", datetime.datetime(2026, 2, 9, 21, 10, 51)),
+            ("D:20260209211051-05'30", datetime.datetime(2026, 2, 10, 2, 40, 51)),
+            ("D:202602", datetime.datetime(2026, 2, 1)),
+        ],
+    )
+    def test_parse(self, text: str, expected: datetime.datetime) -> None:
+        assert parse_pdf_date(text) == expected.replace(tzinfo=datetime.timezone.utc)
+
+    @pytest.mark.parametrize("text", ["", "20260209", "D:20261332000000"])
+    def test_invalid(self, text: str) -> None:
+        assert parse_pdf_date(text) is None
+
+    def test_metadata(self, sample_pdf: Path) -> None:
+        expected = datetime.datetime(2026, 2, 9, 20, 10, 51, tzinfo=datetime.timezone.utc)
+        assert pdf_modified_at(sample_pdf.read_bytes()) == expected
+        assert pdf_modified_at(b"pas un PDF") is None
+
+
+class _FakePage:
+    """Page factice : une ligne de tableau par date, lectures comptabilisées."""
+
+    def __init__(
+        self, dates: list[str], reads: list[int], text_reads: list[int], number: int
+    ) -> None:
+        self._dates = dates
+        self._reads = reads
+        self._text_reads = text_reads
+        self._number = number
+
+    def extract_text(self) -> str:
+        self._text_reads.append(self._number)
+        return ""
+
+    def extract_tables(self) -> list[list[list[str | None]]]:
+        self._reads.append(self._number)
+        return [[[d, "08H00 - 10H00", "Langage C (CM/TD)", "GI-L1", "S-304"] for d in self._dates]]
+
+
+@pytest.fixture
+def fake_backend(monkeypatch: pytest.MonkeyPatch) -> FakeBackend:
+    """Moteur PDF factice dont les pages sont définies par le test."""
+    pages: list[list[str]] = []
+    reads: list[int] = []
+    text_reads: list[int] = []
+
+    @contextmanager
+    def open_fake(source: object) -> Iterator[list[_FakePage]]:
+        yield [_FakePage(dates, reads, text_reads, i) for i, dates in enumerate(pages)]
+
+    monkeypatch.setitem(backends.BACKENDS, "fake", open_fake)
+    return pages, reads, text_reads
+
+
+class TestDateWindow:
+    def test_rows_filtered(self, sample_pdf: Path, expected_courses: list[CourseSlot]) -> None:
+        courses, _ = extract_courses(
+            sample_pdf, date_from=datetime.date(2026, 2, 10), date_to=datetime.date(2026, 2, 11)
+        )
+        assert courses == expected_courses[1:4]
+
+    def test_merged_cell_before_window(self, sample_pdf: Path) -> None:
+        """La date propagée d'une cellule fusionnée est filtrée comme les autres."""
+        courses, _ = extract_courses(sample_pdf, date_to=datetime.date(2026, 2, 10))
+        assert [c.date.day for c in courses] == [9, 10, 10]
+
+    def test_period_clipped(self, sample_pdf: Path) -> None:
+        _, period = extract_courses(sample_pdf, date_from=datetime.date(2026, 2, 15))
+        assert period is not None
+        assert period.start == datetime.date(2026, 2, 15)
+        assert period.end == datetime.date(2026, 2, 28)
+
+    def test_window_outside_period(self, sample_pdf: Path) -> None:
+        courses, period = extract_courses(sample_pdf, date_from=datetime.date(2026, 3, 1))
+        assert courses == []
+        assert period is None
+
+    def test_pages_past_window_skipped(self, fake_backend: FakeBackend) -> None:
+        """Sans en-tête de période, seule la première page est lue pour le chercher."""
+        pages, reads, text_reads = fake_backend
+        pages.extend([["02/03/2026", "03/03/2026"], ["09/03/2026"], ["16/03/2026"]])
+        courses, period = extract_courses(
+            "x.pdf", backend="fake", date_to=datetime.date(2026, 3, 2)
+        )
+        assert [c.date.day for c in courses] == [2]
+        assert reads == [0]
+        assert text_reads == [0]
+        assert period == SchedulePeriod(datetime.date(2026, 3, 2), datetime.date(2026, 3, 2))
+
+    def test_unordered_dates_read_all_pages(self, fake_backend: FakeBackend) -> None:
+        pages, reads, _ = fake_backend
+        pages.extend([["09/03/2026", "02/03/2026"], ["03/03/2026"], ["16/03/2026"]])
+        courses, _ = extract_courses("x.pdf", backend="fake", date_to=datetime.date(2026, 3, 3))
+        assert [c.date.day for c in courses] == [2, 3]
+        assert reads == [0, 1, 2]
@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import dataclasses
 import datetime
+import re
+from pathlib import Path
 
-from icalendar import Calendar
+import pytest
+from icalendar import Calendar, Event
 
+from planning_to_ics import ics_writer
 from planning_to_ics.converter import EventData
-from planning_to_ics.ics_writer import build_calendar
+from planning_to_ics.ics_writer import (
+    ALARMS,
+    build_calendar,
+    fragment_key,
+    reproducible_dtstamp,
+    serialize_calendar,
+    write_ics,
+)
+from planning_to_ics.render_cache import FragmentCache
 
 
 def _make_event_data(**kwargs: object) -> EventData:
@@ -74,3 +87,129 @@ class TestBuildCalendar:
         cal = build_calendar([_make_event_data()], revision=0)
         raw = cal.to_ical().decode()
         assert "DTSTART;TZID=Africa/Porto-Novo:20260210T080000" in raw
+
+
+class TestSerializeCalendar:
+    def _events(self, count: int) -> list[EventData]:
+        base = datetime.datetime(2026, 2, 9, 8, 0)
+        # Ordre volontairement mélangé : la sortie doit être triée par début.
+        return [
+            _make_event_data(
+                uid=f"uid{i:04d}@esgcvak.com",
+                dtstart=base + datetime.timedelta(hours=(i * 7) % count),
+                dtend=base + datetime.timedelta(hours=(i * 7) % count + 2),
+            )
+            for i in range(count)
+        ]
+
+    def test_parallel_matches_serial(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(ics_writer, "PARALLEL_THRESHOLD", 0)
+        events = self._events(50)
+        dtstamp = datetime.datetime(2026, 2, 1, tzinfo=datetime.timezone.utc)
+
+        serial = build_calendar(events, revision=2, dtstamp=dtstamp).to_ical()
+        parallel = serialize_calendar(events, 2, dtstamp=dtstamp, workers=2, chunk_size=7)
+        assert parallel == serial
+
+    def test_events_sorted_by_start(self) -> None:
+        events = self._events(10)
+        raw = serialize_calendar(events, 0).decode()
+        starts = re.findall(r"DTSTART;TZID=Africa/Porto-Novo:(\S+)", raw)
+        assert starts == sorted(starts)
+        assert len(starts) == 10
+
+
+class TestReproducibleOutput:
+    def test_dtstamp_from_digest(self) -> None:
+        digest_a = "a" * 64
+        digest_b = "b" * 64
+        assert reproducible_dtstamp(digest_a) == reproducible_dtstamp(digest_a)
+        assert reproducible_dtstamp(digest_a) != reproducible_dtstamp(digest_b)
+        assert reproducible_dtstamp(digest_a).tzinfo is not None
+
+    def test_byte_stable_regardless_of_input_order(self) -> None:
+        events = [
+            _make_event_data(uid="b@esgcvak.com"),
+            _make_event_data(uid="a@esgcvak.com"),
+        ]
+        dtstamp = reproducible_dtstamp("0" * 64)
+        first = serialize_calendar(events, 0, dtstamp=dtstamp)
+        second = serialize_calendar(events[::-1], 0, dtstamp=dtstamp)
+        assert first == second
+        assert "DTSTAMP:20000101T000000Z" in first.decode()
+
+    def test_write_skipped_when_unchanged(self, tmp_path: Path) -> None:
+        ics_path = tmp_path / "out" / "cal.ics"
+        data = serialize_calendar([_make_event_data()], 0, dtstamp=reproducible_dtstamp("0" * 64))
+
+        assert write_ics(data, ics_path) is True
+        mtime = ics_path.stat().st_mtime_ns
+        assert write_ics(data, ics_path) is False
+        assert ics_path.stat().st_mtime_ns == mtime
+
+        assert write_ics(data.replace(b"SEQUENCE:0", b"SEQUENCE:1"), ics_path) is True
+        assert b"SEQUENCE:1" in ics_path.read_bytes()
+
+
+class TestFragmentCacheRendering:
+    def _events(self) -> list[EventData]:
+        return [
+            _make_event_data(
+                uid=f"uid{i}@esgcvak.com",
+                dtstart=datetime.datetime(2026, 2, 9 + i, 8, 0),
+                dtend=datetime.datetime(2026, 2, 9 + i, 12, 0),
+            )
+            for i in range(5)
+        ]
+
+    def test_cached_output_identical(self, tmp_path: Path) -> None:
+        events = self._events()
+        dtstamp = datetime.datetime(2026, 2, 1, tzinfo=datetime.timezone.utc)
+        expected = build_calendar(events, revision=1, dtstamp=dtstamp).to_ical()
+        with FragmentCache(tmp_path / "f.sqlite3") as cache:
+            first = serialize_calendar(events, 1, dtstamp=dtstamp, cache=cache)
+            later = datetime.datetime(2026, 3, 1, tzinfo=datetime.timezone.utc)
+            second = serialize_calendar(events, 1, dtstamp=later, cache=cache)
+        assert first == expected
+        assert second == build_calendar(events, revision=1, dtstamp=later).to_ical()
+
+    def test_only_changed_events_rendered(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        events = self._events()
+        with FragmentCache(tmp_path / "f.sqlite3") as cache:
+            serialize_calendar(events, 0, cache=cache)
+
+            built: list[str] = []
+            original = ics_writer._build_event
+
+            def counting(
+                event_data: EventData, revision: int, dtstamp: datetime.datetime
+            ) -> Event:
+                built.append(event_data.uid)
+                return original(event_data, revision, dtstamp)
+
+            monkeypatch.setattr(ics_writer, "_build_event", counting)
+            events[2] = dataclasses.replace(events[2], location="S-101, ESGC-VAK")
+            raw = serialize_calendar(events, 0, cache=cache)
+
+        assert built == [events[2].uid]
+        assert b"S-101" in raw
+
+    def test_key_depends_on_revision_and_alarms(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        event = _make_event_data()
+        key = fragment_key(event, 0)
+        assert fragment_key(event, 1) != key
+        monkeypatch.setattr(ics_writer, "ALARMS", ALARMS[:1])
+        assert fragment_key(event, 0) != key
+
+    def test_key_depends_on_render_and_icalendar_versions(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        event = _make_event_data()
+        key = fragment_key(event, 0)
+        monkeypatch.setattr(ics_writer, "RENDER_VERSION", ics_writer.RENDER_VERSION + 1)
+        bumped = fragment_key(event, 0)
+        assert bumped != key
+        monkeypatch.setattr(ics_writer.icalendar, "__version__", "0.0.0")
+        assert fragment_key(event, 0) not in (key, bumped)
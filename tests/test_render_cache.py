@@ -0,0 +1,31 @@
+"""Tests unitaires pour le cache persistant des fragments VEVENT."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from planning_to_ics.render_cache import FragmentCache
+
+
+class TestFragmentCache:
+    def test_roundtrip_persistent(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache" / "fragments.sqlite3"
+        with FragmentCache(path) as cache:
+            cache.put_many({"a": b"BEGIN:VEVENT\r\nEND:VEVENT\r\n"})
+        with FragmentCache(path) as cache:
+            assert cache.get_many(["a", "b"]) == {"a": b"BEGIN:VEVENT\r\nEND:VEVENT\r\n"}
+
+    def test_size_bounded(self, tmp_path: Path) -> None:
+        with FragmentCache(tmp_path / "f.sqlite3", max_bytes=250) as cache:
+            for i in range(10):
+                cache.put_many({f"k{i}": b"x" * 100})
+            assert cache.size <= 250
+            assert set(cache.get_many([f"k{i}" for i in range(10)])) == {"k8", "k9"}
+
+    def test_least_recently_used_evicted(self, tmp_path: Path) -> None:
+        with FragmentCache(tmp_path / "f.sqlite3", max_bytes=250) as cache:
+            cache.put_many({"old": b"x" * 100})
+            cache.put_many({"mid": b"x" * 100})
+            cache.get_many(["old"])  # "old" redevient le plus récent
+            cache.put_many({"new": b"x" * 100})
+            assert set(cache.get_many(["old", "mid", "new"])) == {"old", "new"}
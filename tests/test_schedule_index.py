@@ -0,0 +1,102 @@
+"""Tests unitaires pour l'index des créneaux et la détection de conflits."""
+
+from __future__ import annotations
+
+import datetime
+
+from planning_to_ics.models import CourseSlot
+from planning_to_ics.schedule_index import IntervalIndex, ScheduleIndex
+
+
+def _make_slot(**kwargs: object) -> CourseSlot:
+    defaults: dict[str, object] = {
+        "date": datetime.date(2026, 2, 10),
+        "start_time": datetime.time(8, 0),
+        "end_time": datetime.time(12, 0),
+        "course_name": "Théorie des Graphes et Optimisation des Procédés",
+        "course_type": "CM/TD",
+        "class_group": "GI-L2",
+        "room": "S-301",
+    }
+    defaults.update(kwargs)
+    return CourseSlot(**defaults)  # type: ignore[arg-type]
+
+
+class TestIntervalIndex:
+    def test_overlapping(self) -> None:
+        index = IntervalIndex([(0, 10, "a"), (5, 6, "b"), (12, 15, "c")])
+        assert index.overlapping(6, 12) == ["a"]
+        assert index.overlapping(5, 13) == ["a", "b", "c"]
+        assert index.overlapping(10, 12) == []
+
+    def test_covering(self) -> None:
+        index = IntervalIndex([(0, 10, "a"), (5, 6, "b"), (12, 15, "c")])
+        assert index.covering(5) == ["a", "b"]
+        assert index.covering(10) == []
+        assert index.covering(12) == ["c"]
+
+    def test_long_interval_not_missed(self) -> None:
+        """Un intervalle long commencé tôt reste visible derrière des courts."""
+        intervals = [(0, 100, "long")] + [(i, i + 1, f"s{i}") for i in range(1, 50)]
+        index = IntervalIndex(intervals)
+        assert index.covering(75) == ["long"]
+
+
+class TestScheduleIndex:
+    def test_query_by_group_and_date(self, expected_courses: list[CourseSlot]) -> None:
+        index = ScheduleIndex(expected_courses)
+        found = index.query(date=datetime.date(2026, 2, 10), group="GI-L2")
+        assert [e.slot for e in found] == [expected_courses[1]]
+
+    def test_query_by_room_and_date(self, expected_courses: list[CourseSlot]) -> None:
+        index = ScheduleIndex(expected_courses)
+        found = index.query(date=datetime.date(2026, 2, 10), room="S-304")
+        assert [e.slot.start_time for e in found] == [datetime.time(14, 0)]
+
+    def test_duplicates_indexed_once(self, expected_courses: list[CourseSlot]) -> None:
+        index = ScheduleIndex(expected_courses, teacher="a")
+        index.add(expected_courses, teacher="a")
+        assert len(index) == len(expected_courses)
+
+    def test_shared_slot_kept_for_each_teacher(self) -> None:
+        """Co-enseignement : le créneau apparaît pour chaque enseignant, sans conflit."""
+        index = ScheduleIndex([_make_slot()], teacher="a")
+        index.add([_make_slot()], teacher="b")
+        assert [e.teacher for e in index.query(teacher="b")] == ["b"]
+        assert len(index.query(room="S-301")) == 2
+        assert index.conflicts() == []
+
+    def test_no_conflicts_in_sample(self, expected_courses: list[CourseSlot]) -> None:
+        assert ScheduleIndex(expected_courses, teacher="prof").conflicts() == []
+
+    def test_room_double_booked(self) -> None:
+        index = ScheduleIndex([_make_slot()], teacher="a")
+        other = _make_slot(
+            start_time=datetime.time(11, 0),
+            end_time=datetime.time(13, 0),
+            class_group="GC-L3",
+            course_name="Béton armé",
+        )
+        index.add([other], teacher="b")
+        conflicts = index.conflicts()
+        assert [(c.kind, c.key) for c in conflicts] == [("salle", "S-301")]
+        assert conflicts[0].first.teacher == "a"
+        assert conflicts[0].second.teacher == "b"
+
+    def test_adjacent_slots_do_not_conflict(self) -> None:
+        index = ScheduleIndex(
+            [
+                _make_slot(),
+                _make_slot(start_time=datetime.time(12, 0), end_time=datetime.time(14, 0)),
+            ],
+            teacher="a",
+        )
+        assert index.conflicts() == []
+
+    def test_group_and_teacher_conflicts(self) -> None:
+        index = ScheduleIndex(
+            [_make_slot(), _make_slot(room="S-304", start_time=datetime.time(9, 0))],
+            teacher="a",
+        )
+        kinds = sorted(c.kind for c in index.conflicts())
+        assert kinds == ["classe", "enseignant"]
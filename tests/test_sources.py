@@ -0,0 +1,163 @@
+"""Tests de la lecture des PDF depuis des archives ZIP et des exports mail."""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import mailbox
+import zipfile
+from email.message import EmailMessage
+from pathlib import Path
+
+from planning_to_ics.models import CourseSlot, SchedulePeriod
+from planning_to_ics.sources import (
+    extract_inputs,
+    merge_extractions,
+    read_pdf_inputs,
+)
+
+UTC = datetime.timezone.utc
+_SENT_V1 = "Mon, 09 Feb 2026 08:15:00 +0100"
+_SENT_V2 = "Mon, 16 Feb 2026 08:30:00 +0100"
+
+
+def _mail_with_pdf(data: bytes, filename: str, date: str | None = None) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = "Emploi du temps"
+    if date is not None:
+        message["Date"] = date
+    message.set_content("Veuillez trouver ci-joint votre emploi du temps.")
+    message.add_attachment(data, maintype="application", subtype="pdf", filename=filename)
+    return message
+
+
+class TestReadPdfInputs:
+    def test_plain_pdf(self, sample_pdf: Path) -> None:
+        inputs = read_pdf_inputs(sample_pdf)
+        assert [pdf.name for pdf in inputs] == [sample_pdf.name]
+        assert inputs[0].data == sample_pdf.read_bytes()
+
+    def test_zip_members(self, sample_pdf: Path, tmp_path: Path) -> None:
+        archive = tmp_path / "plannings.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("semaine/planning.pdf", sample_pdf.read_bytes())
+            z.writestr("lisezmoi.txt", "pas un PDF")
+        inputs = read_pdf_inputs(archive)
+        assert [pdf.name for pdf in inputs] == ["plannings.zip:semaine/planning.pdf"]
+        assert inputs[0].stem == "planning"
+
+    def test_eml_attachment(self, sample_pdf: Path, tmp_path: Path) -> None:
+        eml = tmp_path / "message.eml"
+        eml.write_bytes(bytes(_mail_with_pdf(sample_pdf.read_bytes(), "edt.pdf")))
+        inputs = read_pdf_inputs(eml)
+        assert [pdf.name for pdf in inputs] == ["message.eml:edt.pdf"]
+        assert inputs[0].data == sample_pdf.read_bytes()
+
+    def test_mbox_duplicates_skipped(self, sample_pdf: Path, tmp_path: Path) -> None:
+        """La même pièce jointe transférée plusieurs fois n'est lue qu'une fois."""
+        path = tmp_path / "export.mbox"
+        box = mailbox.mbox(path)
+        box.add(_mail_with_pdf(sample_pdf.read_bytes(), "edt.pdf"))
+        box.add(_mail_with_pdf(sample_pdf.read_bytes(), "edt_transfert.pdf"))
+        box.close()
+        inputs = read_pdf_inputs(path)
+        assert [pdf.name for pdf in inputs] == ["export.mbox:edt.pdf"]
+
+    def test_mbox_ordered_by_date(self, sample_pdf: Path, tmp_path: Path) -> None:
+        """Le PDF le plus récent vient en dernier, quel que soit l'ordre de la boîte."""
+        path = tmp_path / "export.mbox"
+        box = mailbox.mbox(path)
+        box.add(_mail_with_pdf(sample_pdf.read_bytes() + b"\n", "v2.pdf", _SENT_V2))
+        box.add(_mail_with_pdf(sample_pdf.read_bytes(), "v1.pdf", _SENT_V1))
+        box.close()
+        inputs = read_pdf_inputs(path)
+        assert [pdf.stem for pdf in inputs] == ["v1", "v2"]
+        assert inputs[1].sent_at == datetime.datetime(2026, 2, 16, 7, 30, tzinfo=UTC)
+
+    def test_zip_ordered_by_member_date(self, sample_pdf: Path, tmp_path: Path) -> None:
+        archive = tmp_path / "plannings.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            newer = zipfile.ZipInfo("b.pdf", (2026, 2, 16, 9, 0, 0))
+            older = zipfile.ZipInfo("a.pdf", (2026, 2, 9, 9, 0, 0))
+            z.writestr(newer, sample_pdf.read_bytes())
+            z.writestr(older, sample_pdf.read_bytes() + b"\n")
+        assert [pdf.stem for pdf in read_pdf_inputs(archive)] == ["a", "b"]
+
+
+class TestExtractInputs:
+    def test_parallel_matches_serial(
+        self, sample_pdf: Path, tmp_path: Path, expected_courses: list[CourseSlot]
+    ) -> None:
+        archive = tmp_path / "plannings.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("a.pdf", sample_pdf.read_bytes())
+            z.writestr("b.pdf", sample_pdf.read_bytes() + b"\n")
+        inputs = read_pdf_inputs(archive)
+        assert len(inputs) == 2
+
+        serial = extract_inputs(inputs, workers=1)
+        assert extract_inputs(inputs, workers=2) == serial
+        assert serial[0][0] == expected_courses
+
+
+class TestMergeExtractions:
+    def test_latest_pdf_wins(self, expected_courses: list[CourseSlot]) -> None:
+        moved = dataclasses.replace(expected_courses[0], room="S-101")
+        start = datetime.date(2026, 2, 9)
+        first = (expected_courses, SchedulePeriod(start, datetime.date(2026, 2, 14)))
+        second = ([moved], SchedulePeriod(start, start))
+
+        courses, period = merge_extractions([first, second])
+        assert len(courses) == len(expected_courses)
+        assert courses[0].room == "S-101"
+        assert period == first[1]
+
+    def test_rescheduled_course_replaced(self, expected_courses: list[CourseSlot]) -> None:
+        """Un cours déplacé à 14h dans le PDF plus récent ne garde pas son créneau de 8h."""
+        tuesday = datetime.date(2026, 2, 10)
+        morning = [c for c in expected_courses if c.class_group == "GI-L2"][:1]
+        afternoon = dataclasses.replace(
+            morning[0], start_time=datetime.time(14), end_time=datetime.time(18)
+        )
+        day = SchedulePeriod(tuesday, tuesday)
+        courses, _ = merge_extractions([(morning, day), ([afternoon], day)])
+        assert courses == [afternoon]
+
+    def test_cancelled_course_dropped(self, expected_courses: list[CourseSlot]) -> None:
+        start = datetime.date(2026, 2, 9)
+        week = SchedulePeriod(start, datetime.date(2026, 2, 14))
+        first = (expected_courses, week)
+        second = ([], SchedulePeriod(datetime.date(2026, 2, 10), datetime.date(2026, 2, 10)))
+
+        courses, period = merge_extractions([first, second])
+        assert datetime.date(2026, 2, 10) not in {c.date for c in courses}
+        assert len(courses) == len(expected_courses) - 2
+        assert period == week
+
+    def test_other_teachers_kept(self) -> None:
+        """Deux enseignants, même semaine : les cours de chacun sont conservés."""
+        week = SchedulePeriod(datetime.date(2026, 2, 9), datetime.date(2026, 2, 14))
+        graphes = CourseSlot(
+            date=datetime.date(2026, 2, 10),
+            start_time=datetime.time(8),
+            end_time=datetime.time(12),
+            course_name="Théorie des Graphes",
+            course_type="CM/TD",
+            class_group="GI-L2",
+            room="S-301",
+        )
+        beton = dataclasses.replace(
+            graphes, course_name="Béton armé", class_group="GC-L3", room="S-201"
+        )
+        results = [([graphes], week), ([beton], week)]
+
+        courses, _ = merge_extractions(results, sources=["prof_a", "prof_b"])
+        assert courses == [graphes, beton]
+        courses, _ = merge_extractions(results, sources=["prof_a", "prof_a"])
+        assert courses == [beton]
+
+    def test_shared_slot_kept_once(self, expected_courses: list[CourseSlot]) -> None:
+        week = SchedulePeriod(datetime.date(2026, 2, 9), datetime.date(2026, 2, 14))
+        results = [(expected_courses, week), (expected_courses[:1], week)]
+        courses, _ = merge_extractions(results, sources=["prof_a", "prof_b"])
+        assert courses == expected_courses